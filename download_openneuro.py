@@ -6,108 +6,214 @@ This script downloads datasets from OpenNeuro and prepares them for DIPY process
 """
 
 import argparse
-import json
 import os
-import subprocess
+import re
 import sys
-from datetime import datetime
 from pathlib import Path
-import glob
+
+# File suffixes that make up a DWI acquisition
+DWI_SUFFIXES = ('.nii.gz', '.bval', '.bvec')
+
+# BIDS naming conventions for subject and session labels
+SUBJECT_ID_RE = re.compile(r'^sub-[A-Za-z0-9]+$')
+SESSION_ID_RE = re.compile(r'^ses-[A-Za-z0-9]+$')
+
+# Accepted spellings for boolean command line values
+BOOL_VALUES = {
+    'yes': True, 'true': True, 't': True, 'y': True, '1': True,
+    'no': False, 'false': False, 'f': False, 'n': False, '0': False,
+}
 
 
 def str_to_bool(value):
     """Convert string to boolean value."""
     if isinstance(value, bool):
         return value
-    if value.lower() in ('yes', 'true', 't', 'y', '1'):
-        return True
-    elif value.lower() in ('no', 'false', 'f', 'n', '0'):
-        return False
-    else:
+    try:
+        return BOOL_VALUES[value.lower()]
+    except (KeyError, AttributeError):
         raise argparse.ArgumentTypeError('Boolean value expected.')
 
 
-def run_command(command, description=""):
-    """Run a shell command and handle errors."""
-    print(f"\n🔄 {description}")
-    print(f"Command: {' '.join(command)}")
-    
+def dump_json_bytes(obj):
+    """Serialize to compact JSON bytes, using C-accelerated orjson when available."""
     try:
-        result = subprocess.run(command, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed successfully")
-        if result.stdout:
-            print(f"Output: {result.stdout}")
-        return result
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed")
-        print(f"Error: {e.stderr}")
-        sys.exit(1)
+        import orjson
+        return orjson.dumps(obj)
+    except ImportError:
+        import json
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def validate_bids_ids(subject_id, session_id=None):
+    """Exit early when the subject or session ID is not BIDS-shaped.
+
+    A typo in --subject-id would otherwise only surface after the whole
+    dataset has been downloaded and searched.
+    """
+    if not SUBJECT_ID_RE.match(subject_id):
+        print(f"❌ Invalid subject ID '{subject_id}' (expected e.g. sub-01)")
+        sys.exit(2)
+    if session_id and not SESSION_ID_RE.match(session_id):
+        print(f"❌ Invalid session ID '{session_id}' (expected e.g. ses-01)")
+        sys.exit(2)
 
 
-def download_openneuro_dataset(dataset_id, subject_id, session_id=None, download_dir="data"):
+def cache_marker_path(dataset_id, subject_id, session_id, download_dir):
+    """Build the path of the marker file recording a completed download."""
+    import hashlib
+    cache_key = hashlib.sha1(
+        f"{dataset_id}|{subject_id}|{session_id}".encode()
+    ).hexdigest()[:12]
+    return os.path.join(download_dir, f".nh_cache_{cache_key}")
+
+
+def download_openneuro_dataset(dataset_id, subject_id, session_id=None, download_dir="data",
+                               jobs=16, force=False, skip_downloaded=False):
     """Download dataset from OpenNeuro using openneuro-py."""
-    print("=" * 60)
-    print("DOWNLOADING OPENNEURO DATASET")
-    print("=" * 60)
-    
+    banner = '=' * 60
+    sys.stdout.write(f"{banner}\nDOWNLOADING OPENNEURO DATASET\n{banner}\n")
+
     # Create download directory
-    Path(download_dir).mkdir(exist_ok=True)
-    
-    # Build openneuro-py download command
-    cmd = ["openneuro", "download", dataset_id, download_dir]
-    
-    # Add subject filter
+    os.makedirs(download_dir, exist_ok=True)
+
+    # Warn early when the disk is unlikely to hold a DWI dataset, rather
+    # than failing halfway through with a partial tree to clean up
+    import shutil
+    free_bytes = shutil.disk_usage(download_dir).free
+    if free_bytes < 1 << 30:
+        print(f"⚠️  Low disk space: only {free_bytes / (1 << 20):.0f} MB free in {download_dir}")
+
+    dataset_path = os.path.join(download_dir, dataset_id)
+
+    # Skip the download entirely when a previous run for the same
+    # dataset/subject/session combination already completed
+    marker = cache_marker_path(dataset_id, subject_id, session_id, download_dir)
+    if not force and os.path.exists(marker):
+        print(f"✅ Using cached download for {dataset_id} (marker: {marker})")
+        return dataset_path
+
+    # Optionally skip the network when the expected files are already on disk
+    if skip_downloaded and not force:
+        existing = find_dwi_files(dataset_path, subject_id, session_id)
+        if all(key in existing for key in ('dwi', 'bval', 'bvec')):
+            print(f"✅ All DWI files already present, skipping download of {dataset_id}")
+            return dataset_path
+
+    # Import lazily so --help and argument errors stay fast
+    import openneuro
+
+    # Build include filters for subject (and optional session)
+    include = []
     if subject_id:
-        cmd.extend(["--include", f"{subject_id}*"])
-    
-    # Add session filter if specified
+        include.append(f"{subject_id}*")
     if session_id:
-        cmd.extend(["--include", f"*{session_id}*"])
-    
-    run_command(cmd, f"Downloading {dataset_id}")
-    
-    return os.path.join(download_dir, dataset_id)
+        include.append(f"*{session_id}*")
+
+    print(f"\n🔄 Downloading {dataset_id}")
+    try:
+        openneuro.download(
+            dataset=dataset_id,
+            # openneuro-py writes files directly into target_dir (no
+            # per-dataset subdirectory), so point it at dataset_path to
+            # keep find_dwi_files and the returned path working
+            target_dir=dataset_path,
+            include=include,
+            max_concurrent_downloads=jobs
+        )
+        print(f"✅ Downloading {dataset_id} completed successfully")
+    except Exception as e:
+        print(f"❌ Downloading {dataset_id} failed")
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    # Record the completed download so later runs can skip it
+    Path(marker).touch()
+
+    return dataset_path
+
+
+def verify_files(paths):
+    """Stat files concurrently and return the set of paths that are missing or empty.
+
+    Batching the stat calls through a thread pool lets the kernel overlap
+    the metadata work, which matters on network or FUSE-mounted datasets.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def check(path):
+        try:
+            return path if os.stat(path).st_size == 0 else None
+        except OSError:
+            return path
+
+    if not paths:
+        return set()
+
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+        return {p for p in executor.map(check, paths) if p is not None}
+
+
+def scan_dwi_dir(dirpath):
+    """Classify the files in a single dwi/ directory by suffix."""
+    found = {}
+    for entry in os.scandir(dirpath):
+        filename = entry.name
+        if not filename.endswith(DWI_SUFFIXES) or not entry.is_file():
+            continue
+        if filename.endswith('.nii.gz'):
+            if 'dwi' in filename:
+                found['dwi'] = entry.path
+        elif filename.endswith('.bval'):
+            found['bval'] = entry.path
+        else:
+            found['bvec'] = entry.path
+    return found
 
 
 def find_dwi_files(dataset_path, subject_id, session_id=None):
     """Find DWI files in the downloaded dataset."""
     print("\n🔍 Searching for DWI files...")
-    
-    # Build search patterns
-    if session_id:
-        search_patterns = [
-            f"{dataset_path}/{subject_id}/{session_id}/dwi/*.nii.gz",
-            f"{dataset_path}/{subject_id}/{session_id}/dwi/*.bval",
-            f"{dataset_path}/{subject_id}/{session_id}/dwi/*.bvec"
-        ]
-    else:
-        search_patterns = [
-            f"{dataset_path}/{subject_id}/*/dwi/*.nii.gz",
-            f"{dataset_path}/{subject_id}/dwi/*.nii.gz",
-            f"{dataset_path}/{subject_id}/*/dwi/*.bval",
-            f"{dataset_path}/{subject_id}/dwi/*.bval",
-            f"{dataset_path}/{subject_id}/*/dwi/*.bvec",
-            f"{dataset_path}/{subject_id}/dwi/*.bvec"
-        ]
-    
+
+    base = os.path.join(dataset_path, subject_id)
+
+    # Walk the subject tree once to collect candidate dwi/ directories,
+    # instead of re-globbing overlapping directory trees once per pattern
+    dwi_dirs = []
+    for dirpath, dirnames, filenames in os.walk(base):
+        if os.path.basename(dirpath) != 'dwi':
+            continue
+        if session_id and session_id not in dirpath:
+            continue
+        dwi_dirs.append(dirpath)
+
     dwi_files = {}
-    
-    # Find files
-    for pattern in search_patterns:
-        files = glob.glob(pattern)
-        for file_path in files:
-            filename = os.path.basename(file_path)
-            if filename.endswith('.nii.gz') and 'dwi' in filename:
-                dwi_files['dwi'] = file_path
-            elif filename.endswith('.bval'):
-                dwi_files['bval'] = file_path
-            elif filename.endswith('.bvec'):
-                dwi_files['bvec'] = file_path
-    
+
+    # Multi-session subjects can have many dwi/ dirs; scan them concurrently
+    # since the filesystem can serve parallel directory listings
+    if len(dwi_dirs) > 4:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(8, len(dwi_dirs))) as executor:
+            for partial in executor.map(scan_dwi_dir, dwi_dirs):
+                dwi_files.update(partial)
+                if len(dwi_files) == 3:
+                    break
+    else:
+        for dirpath in dwi_dirs:
+            dwi_files.update(scan_dwi_dir(dirpath))
+            if len(dwi_files) == 3:
+                break
+
+    # Drop any files that are missing or truncated before reporting them
+    bad_paths = verify_files(list(dwi_files.values()))
+    if bad_paths:
+        print(f"⚠️  Ignoring {len(bad_paths)} empty or unreadable file(s)")
+        dwi_files = {k: v for k, v in dwi_files.items() if v not in bad_paths}
+
     print(f"Found DWI files:")
     for key, path in dwi_files.items():
         print(f"  {key}: {path}")
-    
+
     return dwi_files
 
 
@@ -134,25 +240,58 @@ def main():
         required=False,
         help='Session ID (optional, e.g., ses-01)'
     )
-    
+
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=16,
+        help='Maximum number of concurrent file downloads (default: 16)'
+    )
+
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-download even if a cached copy exists'
+    )
+
+    parser.add_argument(
+        '--skip-downloaded',
+        action='store_true',
+        help='Skip the download when the DWI files already exist on disk'
+    )
+
     args = parser.parse_args()
+
+    # Imported here so --help and argparse errors exit without paying for it
+    from datetime import datetime
+
+    timestamp = datetime.now().isoformat()
+
+    # Print configuration with a single write
+    banner = '=' * 60
+    sys.stdout.write(
+        f"{banner}\n"
+        f"OPENNEURO DATASET DOWNLOAD\n"
+        f"{banner}\n"
+        f"Dataset ID: {args.dataset_id}\n"
+        f"Subject ID: {args.subject_id}\n"
+        f"Session ID: {args.session_id or 'Not specified'}\n"
+        f"Timestamp: {timestamp}\n"
+        f"{banner}\n"
+    )
     
-    # Print configuration
-    print("=" * 60)
-    print("OPENNEURO DATASET DOWNLOAD")
-    print("=" * 60)
-    print(f"Dataset ID: {args.dataset_id}")
-    print(f"Subject ID: {args.subject_id}")
-    print(f"Session ID: {args.session_id or 'Not specified'}")
-    print(f"Timestamp: {datetime.now().isoformat()}")
-    print("=" * 60)
-    
+    # Catch malformed IDs before paying for a download
+    validate_bids_ids(args.subject_id, args.session_id)
+
     try:
         # Download dataset
         dataset_path = download_openneuro_dataset(
             args.dataset_id,
             args.subject_id,
-            args.session_id
+            args.session_id,
+            jobs=args.jobs,
+            force=args.force,
+            skip_downloaded=args.skip_downloaded
         )
         
         # Find DWI files
@@ -169,20 +308,25 @@ def main():
             'session_id': args.session_id,
             'dataset_path': dataset_path,
             'dwi_files': dwi_files,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         }
         
-        # Save file information
-        with open("dataset_info.json", 'w') as f:
-            json.dump(file_info, f, indent=2)
-        
-        # Set GitHub Actions output variables
+        # Save file information in one compact write
+        Path("dataset_info.json").write_bytes(dump_json_bytes(file_info))
+
+        # Set GitHub Actions output variables with a single write syscall
         if os.getenv('GITHUB_OUTPUT'):
-            with open(os.environ['GITHUB_OUTPUT'], 'a') as f:
-                f.write(f"dwi_file={dwi_files.get('dwi', '')}\n")
-                f.write(f"bval_file={dwi_files.get('bval', '')}\n")
-                f.write(f"bvec_file={dwi_files.get('bvec', '')}\n")
-                f.write(f"dataset_path={dataset_path}\n")
+            payload = (
+                f"dwi_file={dwi_files.get('dwi', '')}\n"
+                f"bval_file={dwi_files.get('bval', '')}\n"
+                f"bvec_file={dwi_files.get('bvec', '')}\n"
+                f"dataset_path={dataset_path}\n"
+            ).encode()
+            fd = os.open(os.environ['GITHUB_OUTPUT'], os.O_WRONLY | os.O_APPEND)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
         
         print("\n" + "=" * 60)
         print("🎉 DOWNLOAD COMPLETED SUCCESSFULLY!")
@@ -4,28 +4,724 @@ Grant Deadline Tracker
 Scrapes funding opportunities and tracks deadlines automatically
 """
 
+import hashlib
 import os
 import sys
 import requests
 import json
 from datetime import datetime, timedelta
+from functools import lru_cache
+from html import escape
+from operator import itemgetter
 from pathlib import Path
 import time
 import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Regex patterns used by the page parsers, compiled once at import
+SECTION_CLASS_RE = re.compile(r'grant|funding|opportunity', re.IGNORECASE)
+DOLLAR_RE = re.compile(r'\$([0-9,]+)')
+
+# Only these tags carry anything the parsers look at; everything else
+# (scripts, styles, tables, navigation chrome) is skipped at parse time
+PAGE_STRAINER = SoupStrainer(['h1', 'title', 'meta', 'p', 'div', 'section', 'a'])
+
+# Read at most this much of a response body; grant pages that matter are
+# far smaller, and the cap bounds memory on pathological pages
+MAX_PAGE_BYTES = 512 * 1024
+
+# Month names for date display; indexing a tuple skips strftime's
+# per-call format parsing and locale machinery
+_MONTHS = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+           'August', 'September', 'October', 'November', 'December')
+
+
+def format_long_date(dt):
+    """Format a datetime like 'March 05, 2027' without strftime"""
+    return f"{_MONTHS[dt.month - 1]} {dt.day:02d}, {dt.year}"
+
+# Site stylesheet, written out as a static grant_docs/styles.css; it never
+# changes between runs, so it is not rebuilt inside the page f-string
+SITE_CSS = """\
+* { margin: 0; padding: 0; box-sizing: border-box; }
+
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', system-ui, sans-serif;
+    line-height: 1.6;
+    color: #333;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    min-height: 100vh;
+}
+
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+    padding: 20px;
+}
+
+.header {
+    background: rgba(255, 255, 255, 0.95);
+    backdrop-filter: blur(10px);
+    border-radius: 20px;
+    padding: 30px;
+    margin-bottom: 30px;
+    text-align: center;
+    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+}
+
+.header h1 {
+    font-size: 2.5rem;
+    margin-bottom: 10px;
+    background: linear-gradient(45deg, #667eea, #764ba2);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    background-clip: text;
+}
+
+.stats {
+    display: flex;
+    justify-content: center;
+    gap: 30px;
+    flex-wrap: wrap;
+    margin-top: 20px;
+}
+
+.stat {
+    text-align: center;
+}
+
+.stat-number {
+    font-size: 2rem;
+    font-weight: bold;
+    color: #667eea;
+}
+
+.stat-label {
+    color: #666;
+    font-size: 0.9rem;
+}
+
+.controls {
+    background: rgba(255, 255, 255, 0.95);
+    backdrop-filter: blur(10px);
+    border-radius: 15px;
+    padding: 20px;
+    margin-bottom: 30px;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    flex-wrap: wrap;
+    gap: 15px;
+    box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1);
+}
+
+.search-box {
+    flex: 1;
+    min-width: 300px;
+}
+
+.search-box input {
+    width: 100%;
+    padding: 12px 20px;
+    border: 2px solid #e1e5e9;
+    border-radius: 25px;
+    font-size: 1rem;
+    transition: all 0.3s ease;
+}
+
+.search-box input:focus {
+    outline: none;
+    border-color: #667eea;
+    box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
+}
+
+.filter-buttons {
+    display: flex;
+    gap: 10px;
+    flex-wrap: wrap;
+}
+
+.filter-btn {
+    padding: 8px 16px;
+    border: 2px solid #667eea;
+    background: white;
+    color: #667eea;
+    border-radius: 20px;
+    cursor: pointer;
+    transition: all 0.3s ease;
+    text-decoration: none;
+}
+
+.filter-btn.active {
+    background: #667eea;
+    color: white;
+}
+
+.rss-link {
+    background: #ff6b6b;
+    color: white;
+    padding: 12px 24px;
+    border-radius: 25px;
+    text-decoration: none;
+    font-weight: 500;
+    transition: all 0.3s ease;
+}
+
+.rss-link:hover {
+    background: #ff5252;
+    transform: translateY(-2px);
+}
+
+.section {
+    margin-bottom: 40px;
+}
+
+.section-header {
+    background: rgba(255, 255, 255, 0.9);
+    padding: 20px 25px;
+    border-radius: 15px;
+    margin-bottom: 20px;
+    font-size: 1.4rem;
+    font-weight: 600;
+    box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
+
+.urgent { color: #ff4444; }
+.upcoming { color: #ff9800; }
+.future { color: #4CAF50; }
+
+.grant {
+    background: rgba(255, 255, 255, 0.95);
+    backdrop-filter: blur(10px);
+    border-radius: 15px;
+    padding: 25px;
+    margin-bottom: 20px;
+    box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1);
+    transition: all 0.3s ease;
+    border-left: 4px solid #4CAF50;
+}
+
+.grant:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.15);
+}
+
+.grant.urgent {
+    border-left-color: #ff4444;
+}
+
+.grant.upcoming {
+    border-left-color: #ff9800;
+}
+
+.grant-title {
+    font-size: 1.3rem;
+    font-weight: bold;
+    color: #333;
+    margin-bottom: 10px;
+    line-height: 1.4;
+}
+
+.grant-title a {
+    color: inherit;
+    text-decoration: none;
+}
+
+.grant-title a:hover {
+    color: #667eea;
+}
+
+.grant-meta {
+    display: flex;
+    gap: 20px;
+    margin-bottom: 15px;
+    flex-wrap: wrap;
+}
+
+.agency {
+    color: #667eea;
+    font-weight: 500;
+}
+
+.amount {
+    color: #4CAF50;
+    font-weight: 500;
+}
+
+.description {
+    color: #555;
+    line-height: 1.6;
+    margin-bottom: 15px;
+}
+
+.deadlines {
+    background: #f8f9fa;
+    padding: 15px;
+    border-radius: 10px;
+    margin-bottom: 15px;
+}
+
+.deadline {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    padding: 8px 0;
+    border-bottom: 1px solid #eee;
+}
+
+.deadline:last-child {
+    border-bottom: none;
+}
+
+.deadline-date {
+    font-weight: bold;
+}
+
+.deadline-countdown {
+    font-size: 0.9rem;
+    padding: 4px 8px;
+    border-radius: 8px;
+    color: white;
+}
+
+.countdown-critical { background: #ff4444; }
+.countdown-warning { background: #ff9800; }
+.countdown-ok { background: #4CAF50; }
+
+.eligibility {
+    display: flex;
+    gap: 5px;
+    flex-wrap: wrap;
+    margin-top: 10px;
+}
+
+.eligibility-tag {
+    background: #e3f2fd;
+    color: #1976d2;
+    padding: 4px 8px;
+    border-radius: 12px;
+    font-size: 0.8rem;
+}
+
+.footer {
+    background: rgba(255, 255, 255, 0.9);
+    backdrop-filter: blur(10px);
+    border-radius: 15px;
+    padding: 20px;
+    text-align: center;
+    margin-top: 40px;
+    color: #666;
+    box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1);
+}
+
+.empty-state {
+    background: rgba(255, 255, 255, 0.9);
+    backdrop-filter: blur(10px);
+    border-radius: 15px;
+    padding: 40px;
+    text-align: center;
+    color: #666;
+    box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1);
+}
+
+@media (max-width: 768px) {
+    .container { padding: 10px; }
+    .header { padding: 20px; }
+    .header h1 { font-size: 2rem; }
+    .controls { flex-direction: column; }
+    .grant { padding: 20px; }
+    .grant-meta { flex-direction: column; gap: 10px; }
+    .deadline { flex-direction: column; align-items: flex-start; gap: 5px; }
+}
+"""
+
+# Broad neuroscience keywords used for relevance filtering
+NEURO_KEYWORDS = frozenset((
+    'brain', 'neural', 'neuroscience', 'cognitive', 'behavior',
+    'fmri', 'eeg', 'imaging', 'psychology', 'psychiatry', 'mental health'
+))
+
+
+def build_keyword_automaton(keywords):
+    """Build an Aho-Corasick automaton over keywords, or None without the C extension.
+
+    The automaton matches every keyword in one pass over the text instead
+    of one substring scan per keyword.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+# Per-grant card markup, interpolated once per grant with str.format.
+# Keeping it at module level means the literal is built a single time
+GRANT_CARD_TEMPLATE = """
+            <div class="grant {urgency_class}" data-urgency="{urgency_class}"
+                 data-searchable="{searchable_text}">
+                <div class="grant-title">
+                    <a href="{url}" target="_blank">{title}</a>
+                </div>
+                <div class="grant-meta">
+                    <div class="agency">🏛️ {agency}</div>
+                    {amount_html}
+                </div>
+                <div class="description">{description}</div>
+                {deadlines_html}
+                {eligibility_html}
+            </div>"""
+
+# Client-side behavior, emitted as a static grant_docs/app.js so browsers
+# cache it across visits; loaded with defer so it runs after parsing
+SITE_JS = """\
+// Search functionality
+const searchInput = document.getElementById('searchInput');
+const filterButtons = document.querySelectorAll('.filter-btn');
+const sections = Array.from(document.querySelectorAll('.section'));
+
+// Index the cards once so filtering reads plain objects instead
+// of re-querying the DOM on every pass
+const grantIndex = Array.from(document.querySelectorAll('.grant')).map(el => ({
+    el: el,
+    text: el.dataset.searchable,
+    urgency: el.dataset.urgency
+}));
+
+let currentFilter = 'all';
+
+// Debounce keystrokes: fast typing triggers one filter pass
+let searchTimer;
+searchInput.addEventListener('input', function() {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(filterGrants, 150);
+});
+
+// One delegated listener on the container instead of one per button
+document.querySelector('.filter-buttons').addEventListener('click', function(e) {
+    const btn = e.target.closest('.filter-btn');
+    if (!btn) return;
+    filterButtons.forEach(b => b.classList.remove('active'));
+    btn.classList.add('active');
+    currentFilter = btn.dataset.filter;
+    filterGrants();
+});
+
+function filterGrants() {
+    const searchTerm = searchInput.value.toLowerCase();
+    const visibleCounts = new Map();
+
+    grantIndex.forEach(entry => {
+        const matchesSearch = entry.text.includes(searchTerm);
+        const matchesFilter = currentFilter === 'all' || entry.urgency === currentFilter;
+        const visible = matchesSearch && matchesFilter;
+        entry.el.style.display = visible ? 'block' : 'none';
+        if (visible) {
+            visibleCounts.set(entry.urgency, (visibleCounts.get(entry.urgency) || 0) + 1);
+        }
+    });
+
+    // Section visibility falls out of the counts gathered in the
+    // same pass; no second DOM scan
+    sections.forEach(section => {
+        const sectionType = section.dataset.section;
+        const matchesFilter = currentFilter === 'all' || currentFilter === sectionType;
+        section.style.display =
+            (matchesFilter && (visibleCounts.get(sectionType) || 0) > 0) ? 'block' : 'none';
+    });
+}
+
+// Countdowns change once per day at most, so instead of rescanning
+// every element each minute, schedule one timer for the next
+// day-boundary crossing and update only then
+const DAY_MS = 24 * 60 * 60 * 1000;
+const countdowns = Array.from(document.querySelectorAll('.deadline-countdown')).map(el => ({
+    el: el,
+    deadline: new Date(el.dataset.deadline)
+}));
+
+function updateCountdowns() {
+    const now = new Date();
+    let nextChangeMs = Infinity;
+
+    countdowns.forEach(entry => {
+        const diffMs = entry.deadline - now;
+        const diffDays = Math.ceil(diffMs / DAY_MS);
+
+        if (diffMs > 0) {
+            const msUntilChange = diffMs - (diffDays - 1) * DAY_MS;
+            if (msUntilChange < nextChangeMs) nextChangeMs = msUntilChange;
+        }
+
+        // The server rendered the current day count and class; skip the
+        // element until the count actually changes
+        if (String(diffDays) === entry.el.dataset.lastDays) return;
+        entry.el.dataset.lastDays = diffDays;
+
+        entry.el.textContent = diffDays <= 0 ? 'EXPIRED' : diffDays + ' days';
+        entry.el.className = 'deadline-countdown ' + (
+            diffDays <= 30 ? 'countdown-critical' :
+            diffDays <= 90 ? 'countdown-warning' : 'countdown-ok');
+    });
+
+    if (nextChangeMs !== Infinity) {
+        setTimeout(updateCountdowns, Math.max(nextChangeMs, 1000));
+    }
+}
+
+updateCountdowns();
+"""
+
+RSS_ITEM_TEMPLATE = """
+    <item>
+        <title>{urgency_emoji} {title}</title>
+        <description><![CDATA[
+            <p><strong>Agency:</strong> {agency}</p>
+            {amounts_html}
+            {deadlines_html}
+            <hr>
+            <p>{description}</p>
+        ]]></description>
+        <link>{url}</link>
+        <guid>{guid}</guid>
+        <pubDate>{pub_date}</pubDate>
+    </item>"""
+
+
+class GrantEncoder(json.JSONEncoder):
+    """JSON encoder that writes datetimes as ISO 8601 strings"""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+@lru_cache(maxsize=4096)
+def parse_deadline_date(text):
+    """Parse a 'Month day, year' candidate, or None when it isn't a date"""
+    # Normalizing away the comma leaves one format to try, so most
+    # non-date candidates cost a single failed strptime
+    try:
+        return datetime.strptime(text.strip().replace(',', ''), '%B %d %Y')
+    except ValueError:
+        return None
+
+# Each source's deadline/amount alternatives are merged into one union
+# pattern so the page text is scanned a single time instead of once per
+# alternative
+# The gaps between a cue word and the date/amount are bounded ({0,80})
+# instead of unbounded .* chains, which backtrack badly on the long
+# non-matching text blobs that get_text() produces
+NIH_DEADLINE_RE = re.compile(
+    r'(?:application[^\n]{0,80}?due|deadline|submit[^\n]{0,80}?by|due\s+date)'
+    r'[^\n]{0,80}?(\w+\s+\d{1,2},?\s+\d{4})',
+    re.IGNORECASE
+)
+
+NSF_DEADLINE_RE = re.compile(
+    r'(?:proposal[^\n]{0,80}?due|deadline|submit[^\n]{0,80}?by|full proposal)'
+    r'[^\n]{0,80}?(\w+\s+\d{1,2},?\s+\d{4})',
+    re.IGNORECASE
+)
+
+FOUNDATION_DEADLINE_RE = re.compile(
+    r'(?:deadline|due|apply[^\n]{0,80}?by|submission)'
+    r'[^\n]{0,80}?(\w+\s+\d{1,2},?\s+\d{4})',
+    re.IGNORECASE
+)
+
+NIH_AMOUNT_RE = re.compile(
+    r'(?:\$|award[^\n]{0,40}?|budget[^\n]{0,40}?)([0-9,]+(?:\.[0-9]{2})?)',
+    re.IGNORECASE
+)
+
+NSF_AMOUNT_RE = re.compile(
+    r'(?:\$|award[^\n]{0,40}?|maximum[^\n]{0,40}?)([0-9,]+(?:\.[0-9]{2})?)',
+    re.IGNORECASE
+)
+
+# Known opportunities with regular deadline cycles. Recurring deadlines
+# are month-day strings resolved to their next occurrence per instance;
+# fixed ones are literal dates
+STATIC_GRANTS = [
+    {
+        'title': 'NIH F31 Predoctoral Fellowship',
+        'agency': 'NIH',
+        'url': 'https://grants.nih.gov/grants/guide/pa-files/PA-23-271.html',
+        'recurring_deadlines': ('April 8', 'August 8', 'December 8'),
+        'amounts': [25000, 30000],
+        'description': 'Predoctoral fellowships for graduate students conducting dissertation research.',
+        'source_type': 'static',
+        'eligibility': ['graduate student', 'phd']
+    },
+    {
+        'title': 'NIH F32 Postdoctoral Fellowship',
+        'agency': 'NIH',
+        'url': 'https://grants.nih.gov/grants/guide/pa-files/PA-23-272.html',
+        'recurring_deadlines': ('April 8', 'August 8', 'December 8'),
+        'amounts': [50000, 60000],
+        'description': 'Postdoctoral fellowships for recent PhD recipients.',
+        'source_type': 'static',
+        'eligibility': ['postdoc', 'recent phd']
+    },
+    {
+        'title': 'NIH K01 Career Development Award',
+        'agency': 'NIH',
+        'url': 'https://grants.nih.gov/grants/guide/pa-files/PA-23-273.html',
+        'recurring_deadlines': ('February 12', 'June 12', 'October 12'),
+        'amounts': [100000, 150000],
+        'description': 'Career development awards for early-career investigators.',
+        'source_type': 'static',
+        'eligibility': ['assistant professor', 'early career']
+    },
+    {
+        'title': 'NSF Graduate Research Fellowship',
+        'agency': 'NSF',
+        'url': 'https://www.nsfgrfp.org/',
+        'deadlines': [datetime(2025, 10, 15)],  # Typically October
+        'amounts': [37000, 46000],
+        'description': 'Fellowship for outstanding graduate students in STEM fields.',
+        'source_type': 'static',
+        'eligibility': ['graduate student', 'early graduate']
+    },
+    {
+        'title': 'Brain & Behavior Research Foundation Young Investigator Grant',
+        'agency': 'Brain & Behavior Research Foundation',
+        'url': 'https://www.bbrfoundation.org/grants-prizes/young-investigator-grants',
+        'deadlines': [datetime(2025, 9, 15)],  # Typically September
+        'amounts': [70000],
+        'description': 'Grants for early-career investigators in brain and behavior research.',
+        'source_type': 'static',
+        'eligibility': ['postdoc', 'assistant professor']
+    },
+    {
+        'title': 'Simons Foundation Autism Research Initiative (SFARI)',
+        'agency': 'Simons Foundation',
+        'url': 'https://www.sfari.org/grant-opportunities/',
+        'recurring_deadlines': ('January 15', 'July 15'),
+        'amounts': [100000, 300000],
+        'description': 'Research grants focused on autism spectrum disorders.',
+        'source_type': 'static',
+        'eligibility': ['assistant professor', 'associate professor', 'professor']
+    }
+]
 
 class GrantTracker:
+    # Minimum spacing between two requests to the same host (politeness)
+    REQUEST_INTERVAL = 0.5
+
     def __init__(self):
         self.grants = []
         self.research_areas = self.parse_research_areas()
         self.institution_type = os.getenv('INSTITUTION_TYPE', 'university').lower()
         self.career_stage = os.getenv('CAREER_STAGE', 'postdoc').lower()
+        # Resolve the GitHub Pages URL once instead of re-splitting the
+        # repository slug at every reference
+        repo = os.getenv('GITHUB_REPOSITORY', 'username/repo')
+        self.repo_owner, _, self.repo_name = repo.partition('/')
+        self.pages_url = f"https://{self.repo_owner}.github.io/{self.repo_name}/"
+        self.session = self.build_session()
+        self._throttle_guard = threading.Lock()
+        self._host_state = {}
+        self._keyword_automaton = build_keyword_automaton(
+            NEURO_KEYWORDS | self.research_areas
+        )
+        self._static_grants = self.build_static_grants()
+        # URLs scraped on previous runs, mapped to when they were last seen
+        self.seen_urls = {
+            g['url']: g['last_updated'] for g in self.load_existing_grants()
+            if g.get('url') and isinstance(g.get('last_updated'), datetime)
+        }
+
+    def select_fresh_urls(self, urls):
+        """Drop duplicate URLs and URLs already scraped within the last day"""
+        cutoff = datetime.now() - timedelta(days=1)
+        fresh = []
+        seen = set()
+        for url in urls:
+            if url in seen:
+                continue
+            seen.add(url)
+            last = self.seen_urls.get(url)
+            if last and last > cutoff:
+                continue
+            fresh.append(url)
+        return fresh
+
+    def polite_get(self, url, timeout=20):
+        """Fetch a URL, keeping per-host politeness without serializing hosts"""
+        host = urlparse(url).netloc
+        with self._throttle_guard:
+            state = self._host_state.setdefault(
+                host, {'lock': threading.Lock(), 'last': 0.0}
+            )
+        with state['lock']:
+            wait = state['last'] + self.REQUEST_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            state['last'] = time.monotonic()
+        return self.fetch_page(url, timeout=timeout)
+
+    def fetch_page(self, url, timeout=20):
+        """Stream a page body, stopping after MAX_PAGE_BYTES"""
+        with self.session.get(url, timeout=timeout, stream=True) as response:
+            chunks = []
+            read = 0
+            for chunk in response.iter_content(chunk_size=65536):
+                chunks.append(chunk)
+                read += len(chunk)
+                if read >= MAX_PAGE_BYTES:
+                    break
+            return b''.join(chunks)
+
+    def build_session(self):
+        """Create the pooled HTTP session shared by all scrapers.
+
+        With requests-cache installed, responses are cached on disk and
+        revalidated via ETag/Last-Modified, so re-runs skip the network
+        for pages that have not changed.
+        """
+        try:
+            from requests_cache import CachedSession
+            Path('grant_docs').mkdir(exist_ok=True)
+            session = CachedSession(
+                'grant_docs/http_cache',
+                backend='sqlite',
+                expire_after=timedelta(hours=6),
+                cache_control=True,
+                stale_if_error=True,
+                allowable_methods=['GET'],
+                allowable_codes=[200]
+            )
+        except ImportError:
+            session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({'User-Agent': 'grant-tracker (GitHub Actions)'})
+        return session
 
     def parse_research_areas(self):
         """Parse research areas from environment"""
         areas_raw = os.getenv('RESEARCH_AREAS', 'neuroscience,cognitive science,brain imaging')
-        return [area.strip().lower() for area in areas_raw.split(',')]
+        return frozenset(area.strip().lower() for area in areas_raw.split(','))
 
     def scrape_nih_grants(self):
         """Scrape NIH funding opportunities"""
@@ -34,21 +730,32 @@ class GrantTracker:
         try:
             # NIH Guide for Grants and Contracts
             url = "https://grants.nih.gov/funding/searchguide/index.html"
-            response = requests.get(url, timeout=30)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Look for funding announcements
-            grant_links = soup.find_all('a', href=re.compile(r'guide.*\.html'))
-
-            for link in grant_links[:20]:  # Limit to avoid overwhelming
-                try:
-                    grant_url = urljoin(url, link.get('href'))
-                    grant_data = self.parse_nih_grant_page(grant_url)
-                    if grant_data and self.is_relevant_grant(grant_data):
-                        self.grants.append(grant_data)
-                    time.sleep(1)  # Be respectful
-                except Exception as e:
-                    print(f"Error parsing NIH grant {link.get('href')}: {e}")
+            content = self.fetch_page(url, timeout=30)
+
+            # Filter links with an XPath evaluated entirely in C rather
+            # than matching a regex against every <a> tag in Python
+            from lxml import html as lxml_html
+            tree = lxml_html.fromstring(content)
+            hrefs = tree.xpath(
+                '//a[contains(@href, "guide") and contains(@href, ".html")]/@href'
+            )
+
+            grant_urls = self.select_fresh_urls(
+                urljoin(url, href)
+                for href in hrefs[:20]  # Limit to avoid overwhelming
+            )
+
+            # Fetch detail pages concurrently; polite_get keeps per-host spacing
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = {executor.submit(self.parse_nih_grant_page, u): u
+                           for u in grant_urls}
+                for future in as_completed(futures):
+                    try:
+                        grant_data = future.result()
+                        if grant_data and self.is_relevant_grant(grant_data):
+                            self.grants.append(grant_data)
+                    except Exception as e:
+                        print(f"Error parsing NIH grant {futures[future]}: {e}")
 
         except Exception as e:
             print(f"Error scraping NIH: {e}")
@@ -56,55 +763,32 @@ class GrantTracker:
     def parse_nih_grant_page(self, url):
         """Parse individual NIH grant page"""
         try:
-            response = requests.get(url, timeout=20)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            content = self.polite_get(url, timeout=20)
+            soup = BeautifulSoup(content, 'lxml', parse_only=PAGE_STRAINER)
 
             # Extract title
             title_elem = soup.find('h1') or soup.find('title')
             title = title_elem.get_text().strip() if title_elem else "Unknown Title"
 
             # Extract deadlines - look for common date patterns
-            text_content = soup.get_text()
-            deadline_patterns = [
-                r'application.*due.*?(\w+\s+\d{1,2},?\s+\d{4})',
-                r'deadline.*?(\w+\s+\d{1,2},?\s+\d{4})',
-                r'submit.*by.*?(\w+\s+\d{1,2},?\s+\d{4})',
-                r'due\s+date.*?(\w+\s+\d{1,2},?\s+\d{4})'
-            ]
+            text_content = soup.get_text(separator=' ', strip=True)
 
             deadlines = []
-            for pattern in deadline_patterns:
-                matches = re.findall(pattern, text_content, re.IGNORECASE)
-                for match in matches:
-                    try:
-                        deadline_date = datetime.strptime(match.strip(), '%B %d, %Y')
-                        if deadline_date > datetime.now():
-                            deadlines.append(deadline_date)
-                    except:
-                        try:
-                            deadline_date = datetime.strptime(match.strip(), '%B %d %Y')
-                            if deadline_date > datetime.now():
-                                deadlines.append(deadline_date)
-                        except:
-                            pass
+            now = datetime.now()
+            for match in NIH_DEADLINE_RE.findall(text_content):
+                deadline_date = parse_deadline_date(match)
+                if deadline_date and deadline_date > now:
+                    deadlines.append(deadline_date)
 
             # Extract award amount
-            amount_patterns = [
-                r'\$([0-9,]+(?:\.[0-9]{2})?)',
-                r'award.*?([0-9,]+)',
-                r'budget.*?([0-9,]+)'
-            ]
-
             amounts = []
-            for pattern in amount_patterns:
-                matches = re.findall(pattern, text_content, re.IGNORECASE)
-                for match in matches:
-                    try:
-                        amount = int(match.replace(',', '').replace('$', ''))
-                        if 1000 <= amount <= 10000000:  # Reasonable grant range
-                            amounts.append(amount)
-                    except:
-                        pass
+            for match in NIH_AMOUNT_RE.findall(text_content):
+                try:
+                    amount = int(match.replace(',', '').replace('$', ''))
+                    if 1000 <= amount <= 10000000:  # Reasonable grant range
+                        amounts.append(amount)
+                except:
+                    pass
 
             # Extract program info
             program_elem = soup.find('meta', {'name': 'description'})
@@ -142,22 +826,31 @@ class GrantTracker:
             base_url = "https://www.nsf.gov"
             search_url = f"{base_url}/funding/"
 
-            response = requests.get(search_url, timeout=30)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Look for funding opportunity links
-            funding_links = soup.find_all('a', href=re.compile(r'funding|solicitation'))
-
-            for link in funding_links[:15]:  # Limit requests
-                try:
-                    grant_url = urljoin(base_url, link.get('href'))
-                    if self.is_nsf_grant_page(grant_url):
-                        grant_data = self.parse_nsf_grant_page(grant_url)
+            content = self.fetch_page(search_url, timeout=30)
+
+            # Look for funding opportunity links with a C-level XPath scan
+            from lxml import html as lxml_html
+            tree = lxml_html.fromstring(content)
+            hrefs = tree.xpath(
+                '//a[contains(@href, "funding") or contains(@href, "solicitation")]/@href'
+            )
+
+            grant_urls = self.select_fresh_urls(
+                u for u in (urljoin(base_url, href)
+                            for href in hrefs[:15])  # Limit requests
+                if self.is_nsf_grant_page(u)
+            )
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = {executor.submit(self.parse_nsf_grant_page, u): u
+                           for u in grant_urls}
+                for future in as_completed(futures):
+                    try:
+                        grant_data = future.result()
                         if grant_data and self.is_relevant_grant(grant_data):
                             self.grants.append(grant_data)
-                    time.sleep(1)
-                except Exception as e:
-                    print(f"Error parsing NSF grant {link.get('href')}: {e}")
+                    except Exception as e:
+                        print(f"Error parsing NSF grant {futures[future]}: {e}")
 
         except Exception as e:
             print(f"Error scraping NSF: {e}")
@@ -170,50 +863,32 @@ class GrantTracker:
     def parse_nsf_grant_page(self, url):
         """Parse individual NSF grant page"""
         try:
-            response = requests.get(url, timeout=20)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            content = self.polite_get(url, timeout=20)
+            soup = BeautifulSoup(content, 'lxml', parse_only=PAGE_STRAINER)
 
             # Extract title
             title_elem = soup.find('h1') or soup.find('title')
             title = title_elem.get_text().strip() if title_elem else "Unknown NSF Grant"
 
             # Extract deadlines
-            text_content = soup.get_text()
-            deadline_patterns = [
-                r'proposal.*due.*?(\w+\s+\d{1,2},?\s+\d{4})',
-                r'deadline.*?(\w+\s+\d{1,2},?\s+\d{4})',
-                r'submit.*by.*?(\w+\s+\d{1,2},?\s+\d{4})',
-                r'full proposal.*?(\w+\s+\d{1,2},?\s+\d{4})'
-            ]
+            text_content = soup.get_text(separator=' ', strip=True)
 
             deadlines = []
-            for pattern in deadline_patterns:
-                matches = re.findall(pattern, text_content, re.IGNORECASE)
-                for match in matches:
-                    try:
-                        deadline_date = datetime.strptime(match.strip(), '%B %d, %Y')
-                        if deadline_date > datetime.now():
-                            deadlines.append(deadline_date)
-                    except:
-                        pass
+            now = datetime.now()
+            for match in NSF_DEADLINE_RE.findall(text_content):
+                deadline_date = parse_deadline_date(match)
+                if deadline_date and deadline_date > now:
+                    deadlines.append(deadline_date)
 
             # NSF grants often have standard amounts
-            amount_patterns = [
-                r'\$([0-9,]+(?:\.[0-9]{2})?)',
-                r'award.*?([0-9,]+)',
-                r'maximum.*?([0-9,]+)'
-            ]
-
             amounts = []
-            for pattern in amount_patterns:
-                matches = re.findall(pattern, text_content, re.IGNORECASE)
-                for match in matches:
-                    try:
-                        amount = int(match.replace(',', '').replace('$', ''))
-                        if 5000 <= amount <= 5000000:  # NSF range
-                            amounts.append(amount)
-                    except:
-                        pass
+            for match in NSF_AMOUNT_RE.findall(text_content):
+                try:
+                    amount = int(match.replace(',', '').replace('$', ''))
+                    if 5000 <= amount <= 5000000:  # NSF range
+                        amounts.append(amount)
+                except:
+                    pass
 
             description = soup.find('meta', {'name': 'description'})
             description = description.get('content', '')[:500] if description else text_content[:500]
@@ -267,13 +942,13 @@ class GrantTracker:
     def scrape_foundation_page(self, foundation):
         """Scrape individual foundation page"""
         try:
-            response = requests.get(foundation['url'], timeout=30)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            content = self.fetch_page(foundation['url'], timeout=30)
+            soup = BeautifulSoup(content, 'lxml', parse_only=PAGE_STRAINER)
 
             grants = []
 
             # Look for grant-related content
-            grant_sections = soup.find_all(['div', 'section'], class_=re.compile(r'grant|funding|opportunity', re.I))
+            grant_sections = soup.find_all(['div', 'section'], class_=SECTION_CLASS_RE)
 
             for section in grant_sections[:5]:  # Limit to avoid noise
                 title_elem = section.find(['h1', 'h2', 'h3', 'h4'])
@@ -286,27 +961,16 @@ class GrantTracker:
                 section_text = section.get_text()
 
                 # Look for deadlines
-                deadline_patterns = [
-                    r'deadline.*?(\w+\s+\d{1,2},?\s+\d{4})',
-                    r'due.*?(\w+\s+\d{1,2},?\s+\d{4})',
-                    r'apply.*by.*?(\w+\s+\d{1,2},?\s+\d{4})',
-                    r'submission.*?(\w+\s+\d{1,2},?\s+\d{4})'
-                ]
-
                 deadlines = []
-                for pattern in deadline_patterns:
-                    matches = re.findall(pattern, section_text, re.IGNORECASE)
-                    for match in matches:
-                        try:
-                            deadline_date = datetime.strptime(match.strip(), '%B %d, %Y')
-                            if deadline_date > datetime.now():
-                                deadlines.append(deadline_date)
-                        except:
-                            pass
+                now = datetime.now()
+                for match in FOUNDATION_DEADLINE_RE.findall(section_text):
+                    deadline_date = parse_deadline_date(match)
+                    if deadline_date and deadline_date > now:
+                        deadlines.append(deadline_date)
 
                 # Extract amounts
                 amounts = []
-                amount_matches = re.findall(r'\$([0-9,]+)', section_text)
+                amount_matches = DOLLAR_RE.findall(section_text)
                 for match in amount_matches:
                     try:
                         amount = int(match.replace(',', ''))
@@ -337,97 +1001,37 @@ class GrantTracker:
         """Add known static grant opportunities with regular deadlines"""
         print("Adding known grant opportunities...")
 
-        static_grants = [
-            {
-                'title': 'NIH F31 Predoctoral Fellowship',
-                'agency': 'NIH',
-                'url': 'https://grants.nih.gov/grants/guide/pa-files/PA-23-271.html',
-                'deadlines': self.generate_recurring_deadlines(['April 8', 'August 8', 'December 8']),
-                'amounts': [25000, 30000],
-                'description': 'Predoctoral fellowships for graduate students conducting dissertation research.',
-                'last_updated': datetime.now(),
-                'source_type': 'static',
-                'eligibility': ['graduate student', 'phd']
-            },
-            {
-                'title': 'NIH F32 Postdoctoral Fellowship',
-                'agency': 'NIH',
-                'url': 'https://grants.nih.gov/grants/guide/pa-files/PA-23-272.html',
-                'deadlines': self.generate_recurring_deadlines(['April 8', 'August 8', 'December 8']),
-                'amounts': [50000, 60000],
-                'description': 'Postdoctoral fellowships for recent PhD recipients.',
-                'last_updated': datetime.now(),
-                'source_type': 'static',
-                'eligibility': ['postdoc', 'recent phd']
-            },
-            {
-                'title': 'NIH K01 Career Development Award',
-                'agency': 'NIH',
-                'url': 'https://grants.nih.gov/grants/guide/pa-files/PA-23-273.html',
-                'deadlines': self.generate_recurring_deadlines(['February 12', 'June 12', 'October 12']),
-                'amounts': [100000, 150000],
-                'description': 'Career development awards for early-career investigators.',
-                'last_updated': datetime.now(),
-                'source_type': 'static',
-                'eligibility': ['assistant professor', 'early career']
-            },
-            {
-                'title': 'NSF Graduate Research Fellowship',
-                'agency': 'NSF',
-                'url': 'https://www.nsfgrfp.org/',
-                'deadlines': [datetime(2025, 10, 15)],  # Typically October
-                'amounts': [37000, 46000],
-                'description': 'Fellowship for outstanding graduate students in STEM fields.',
-                'last_updated': datetime.now(),
-                'source_type': 'static',
-                'eligibility': ['graduate student', 'early graduate']
-            },
-            {
-                'title': 'Brain & Behavior Research Foundation Young Investigator Grant',
-                'agency': 'Brain & Behavior Research Foundation',
-                'url': 'https://www.bbrfoundation.org/grants-prizes/young-investigator-grants',
-                'deadlines': [datetime(2025, 9, 15)],  # Typically September
-                'amounts': [70000],
-                'description': 'Grants for early-career investigators in brain and behavior research.',
-                'last_updated': datetime.now(),
-                'source_type': 'static',
-                'eligibility': ['postdoc', 'assistant professor']
-            },
-            {
-                'title': 'Simons Foundation Autism Research Initiative (SFARI)',
-                'agency': 'Simons Foundation',
-                'url': 'https://www.sfari.org/grant-opportunities/',
-                'deadlines': self.generate_recurring_deadlines(['January 15', 'July 15']),
-                'amounts': [100000, 300000],
-                'description': 'Research grants focused on autism spectrum disorders.',
-                'last_updated': datetime.now(),
-                'source_type': 'static',
-                'eligibility': ['assistant professor', 'associate professor', 'professor']
-            }
-        ]
-
         # Filter by relevance and career stage
-        for grant in static_grants:
-            if self.is_relevant_grant(grant):
-                self.grants.append(grant)
+        self.grants.extend(g for g in self._static_grants
+                           if self.is_relevant_grant(g))
+
+    def build_static_grants(self):
+        """Resolve the static catalog's recurring deadlines once"""
+        now = datetime.now()
+        grants = []
+        for template in STATIC_GRANTS:
+            grant = dict(template)
+            recurring = grant.pop('recurring_deadlines', None)
+            if recurring is not None:
+                grant['deadlines'] = self.generate_recurring_deadlines(recurring)
+            grant['last_updated'] = now
+            grants.append(grant)
+        return grants
 
     def generate_recurring_deadlines(self, date_strings):
         """Generate next occurrence of recurring deadlines"""
         deadlines = []
-        current_year = datetime.now().year
+        now = datetime.now()
 
         for date_str in date_strings:
-            try:
-                # Try current year first
-                deadline = datetime.strptime(f"{date_str} {current_year}", '%B %d %Y')
-                if deadline > datetime.now():
-                    deadlines.append(deadline)
-                else:
-                    # Try next year
-                    deadline = datetime.strptime(f"{date_str} {current_year + 1}", '%B %d %Y')
-                    deadlines.append(deadline)
-            except:
-                pass
+            deadline = parse_deadline_date(f"{date_str} {now.year}")
+            if deadline is None:
+                continue
+            if deadline > now:
+                deadlines.append(deadline)
+            else:
+                # Recurring date already passed this year; roll to next
+                deadlines.append(deadline.replace(year=now.year + 1))
 
         return deadlines
 
@@ -435,8 +1039,15 @@ class GrantTracker:
         """Check if grant is relevant to research areas and career stage"""
         text_to_check = (grant['title'] + ' ' + grant.get('description', '')).lower()
 
-        # Check research area relevance
-        area_match = any(area in text_to_check for area in self.research_areas)
+        # Check research area relevance; a single automaton pass covers
+        # both keyword sets when pyahocorasick is installed
+        if self._keyword_automaton is not None:
+            hits = {found for _, found in self._keyword_automaton.iter(text_to_check)}
+            area_match = bool(hits & self.research_areas)
+            neuro_match = bool(hits & NEURO_KEYWORDS)
+        else:
+            area_match = any(area in text_to_check for area in self.research_areas)
+            neuro_match = any(keyword in text_to_check for keyword in NEURO_KEYWORDS)
 
         # Check career stage eligibility
         eligibility = grant.get('eligibility', [])
@@ -445,21 +1056,10 @@ class GrantTracker:
             career_match = any(stage in self.career_stage or self.career_stage in stage
                              for stage in eligibility)
 
-        # Broad neuroscience keywords
-        neuro_keywords = ['brain', 'neural', 'neuroscience', 'cognitive', 'behavior',
-                         'fmri', 'eeg', 'imaging', 'psychology', 'psychiatry', 'mental health']
-        neuro_match = any(keyword in text_to_check for keyword in neuro_keywords)
-
         return (area_match or neuro_match) and career_match
 
-    def calculate_urgency(self, grant):
-        """Calculate urgency score based on deadlines"""
-        if not grant.get('deadlines'):
-            return 0
-
-        nearest_deadline = min(grant['deadlines'])
-        days_until = (nearest_deadline - datetime.now()).days
-
+    def calculate_urgency(self, days_until):
+        """Calculate urgency score from the days until the nearest deadline"""
         if days_until <= 30:
             return 5  # Critical
         elif days_until <= 90:
@@ -476,21 +1076,25 @@ class GrantTracker:
         grants_file = Path('grant_docs/grants.json')
         if grants_file.exists():
             try:
-                with open(grants_file, 'r') as f:
-                    data = json.load(f)
-                    # Convert date strings back to datetime objects
-                    for grant in data:
-                        if grant.get('deadlines'):
-                            grant['deadlines'] = [
-                                datetime.fromisoformat(d.replace('Z', '+00:00'))
-                                if isinstance(d, str) else d
-                                for d in grant['deadlines']
-                            ]
-                        if grant.get('last_updated'):
-                            grant['last_updated'] = datetime.fromisoformat(
-                                grant['last_updated'].replace('Z', '+00:00')
-                            )
-                    return data
+                raw = grants_file.read_bytes()
+                try:
+                    import orjson
+                    data = orjson.loads(raw)
+                except ImportError:
+                    data = json.loads(raw)
+                # Convert date strings back to datetime objects
+                for grant in data:
+                    if grant.get('deadlines'):
+                        grant['deadlines'] = [
+                            datetime.fromisoformat(d.replace('Z', '+00:00'))
+                            if isinstance(d, str) else d
+                            for d in grant['deadlines']
+                        ]
+                    if grant.get('last_updated'):
+                        grant['last_updated'] = datetime.fromisoformat(
+                            grant['last_updated'].replace('Z', '+00:00')
+                        )
+                return data
             except Exception as e:
                 print(f"Error loading existing grants: {e}")
                 return []
@@ -501,32 +1105,24 @@ class GrantTracker:
         # Ensure docs directory exists
         Path('grant_docs').mkdir(exist_ok=True)
 
-        # Prepare grants for JSON serialization
-        grants_serializable = []
-        for grant in self.grants:
-            grant_copy = grant.copy()
-            if grant_copy.get('deadlines'):
-                grant_copy['deadlines'] = [
-                    d.isoformat() if isinstance(d, datetime) else d
-                    for d in grant_copy['deadlines']
-                ]
-            if isinstance(grant_copy.get('last_updated'), datetime):
-                grant_copy['last_updated'] = grant_copy['last_updated'].isoformat()
-            grants_serializable.append(grant_copy)
-
-        with open('grant_docs/grants.json', 'w') as f:
-            json.dump(grants_serializable, f, indent=2, default=str)
-
-    def generate_html_website(self):
+        # orjson serializes datetimes natively and is several times
+        # faster than the stdlib encoder; fall back when not installed.
+        # grants.json is machine-read only, so skip pretty-printing
+        try:
+            import orjson
+            Path('grant_docs/grants.json').write_bytes(orjson.dumps(self.grants))
+        except ImportError:
+            # Stream straight to the file; the encoder stringifies
+            # datetimes, so no per-grant copies are made
+            with open('grant_docs/grants.json', 'w') as f:
+                json.dump(self.grants, f, separators=(',', ':'), cls=GrantEncoder)
+
+    def generate_html_website(self, out, now):
         """Generate the main HTML website"""
-        # Sort grants by urgency and deadline
-        grants_with_urgency = []
-        for grant in self.grants:
-            grant['urgency'] = self.calculate_urgency(grant)
-            grants_with_urgency.append(grant)
-
-        sorted_grants = sorted(grants_with_urgency,
-                             key=lambda x: (x['urgency'], min(x.get('deadlines', [datetime.max]))),
+        # Sort grants by the urgency and nearest deadline precomputed in
+        # run(); itemgetter keys are plain tuple compares, no per-compare min()
+        sorted_grants = sorted(self.grants,
+                             key=itemgetter('urgency', '_min_deadline'),
                              reverse=True)
 
         # Group by urgency
@@ -534,314 +1130,20 @@ class GrantTracker:
         upcoming_grants = [g for g in sorted_grants if 2 <= g['urgency'] < 4]
         future_grants = [g for g in sorted_grants if g['urgency'] < 2]
 
-        html = f"""<!DOCTYPE html>
+        out.write(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>💰 Grant Deadline Tracker</title>
     <link rel="alternate" type="application/rss+xml" title="Grant Deadlines RSS" href="grants_feed.xml">
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', system-ui, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-
-        .header {{
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(10px);
-            border-radius: 20px;
-            padding: 30px;
-            margin-bottom: 30px;
-            text-align: center;
-            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        }}
-
-        .header h1 {{
-            font-size: 2.5rem;
-            margin-bottom: 10px;
-            background: linear-gradient(45deg, #667eea, #764ba2);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }}
-
-        .stats {{
-            display: flex;
-            justify-content: center;
-            gap: 30px;
-            flex-wrap: wrap;
-            margin-top: 20px;
-        }}
-
-        .stat {{
-            text-align: center;
-        }}
-
-        .stat-number {{
-            font-size: 2rem;
-            font-weight: bold;
-            color: #667eea;
-        }}
-
-        .stat-label {{
-            color: #666;
-            font-size: 0.9rem;
-        }}
-
-        .controls {{
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(10px);
-            border-radius: 15px;
-            padding: 20px;
-            margin-bottom: 30px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            flex-wrap: wrap;
-            gap: 15px;
-            box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1);
-        }}
-
-        .search-box {{
-            flex: 1;
-            min-width: 300px;
-        }}
-
-        .search-box input {{
-            width: 100%;
-            padding: 12px 20px;
-            border: 2px solid #e1e5e9;
-            border-radius: 25px;
-            font-size: 1rem;
-            transition: all 0.3s ease;
-        }}
-
-        .search-box input:focus {{
-            outline: none;
-            border-color: #667eea;
-            box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
-        }}
-
-        .filter-buttons {{
-            display: flex;
-            gap: 10px;
-            flex-wrap: wrap;
-        }}
-
-        .filter-btn {{
-            padding: 8px 16px;
-            border: 2px solid #667eea;
-            background: white;
-            color: #667eea;
-            border-radius: 20px;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            text-decoration: none;
-        }}
-
-        .filter-btn.active {{
-            background: #667eea;
-            color: white;
-        }}
-
-        .rss-link {{
-            background: #ff6b6b;
-            color: white;
-            padding: 12px 24px;
-            border-radius: 25px;
-            text-decoration: none;
-            font-weight: 500;
-            transition: all 0.3s ease;
-        }}
-
-        .rss-link:hover {{
-            background: #ff5252;
-            transform: translateY(-2px);
-        }}
-
-        .section {{
-            margin-bottom: 40px;
-        }}
-
-        .section-header {{
-            background: rgba(255, 255, 255, 0.9);
-            padding: 20px 25px;
-            border-radius: 15px;
-            margin-bottom: 20px;
-            font-size: 1.4rem;
-            font-weight: 600;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-
-        .urgent {{ color: #ff4444; }}
-        .upcoming {{ color: #ff9800; }}
-        .future {{ color: #4CAF50; }}
-
-        .grant {{
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(10px);
-            border-radius: 15px;
-            padding: 25px;
-            margin-bottom: 20px;
-            box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1);
-            transition: all 0.3s ease;
-            border-left: 4px solid #4CAF50;
-        }}
-
-        .grant:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.15);
-        }}
-
-        .grant.urgent {{
-            border-left-color: #ff4444;
-        }}
-
-        .grant.upcoming {{
-            border-left-color: #ff9800;
-        }}
-
-        .grant-title {{
-            font-size: 1.3rem;
-            font-weight: bold;
-            color: #333;
-            margin-bottom: 10px;
-            line-height: 1.4;
-        }}
-
-        .grant-title a {{
-            color: inherit;
-            text-decoration: none;
-        }}
-
-        .grant-title a:hover {{
-            color: #667eea;
-        }}
-
-        .grant-meta {{
-            display: flex;
-            gap: 20px;
-            margin-bottom: 15px;
-            flex-wrap: wrap;
-        }}
-
-        .agency {{
-            color: #667eea;
-            font-weight: 500;
-        }}
-
-        .amount {{
-            color: #4CAF50;
-            font-weight: 500;
-        }}
-
-        .description {{
-            color: #555;
-            line-height: 1.6;
-            margin-bottom: 15px;
-        }}
-
-        .deadlines {{
-            background: #f8f9fa;
-            padding: 15px;
-            border-radius: 10px;
-            margin-bottom: 15px;
-        }}
-
-        .deadline {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 8px 0;
-            border-bottom: 1px solid #eee;
-        }}
-
-        .deadline:last-child {{
-            border-bottom: none;
-        }}
-
-        .deadline-date {{
-            font-weight: bold;
-        }}
-
-        .deadline-countdown {{
-            font-size: 0.9rem;
-            padding: 4px 8px;
-            border-radius: 8px;
-            color: white;
-        }}
-
-        .countdown-critical {{ background: #ff4444; }}
-        .countdown-warning {{ background: #ff9800; }}
-        .countdown-ok {{ background: #4CAF50; }}
-
-        .eligibility {{
-            display: flex;
-            gap: 5px;
-            flex-wrap: wrap;
-            margin-top: 10px;
-        }}
-
-        .eligibility-tag {{
-            background: #e3f2fd;
-            color: #1976d2;
-            padding: 4px 8px;
-            border-radius: 12px;
-            font-size: 0.8rem;
-        }}
-
-        .footer {{
-            background: rgba(255, 255, 255, 0.9);
-            backdrop-filter: blur(10px);
-            border-radius: 15px;
-            padding: 20px;
-            text-align: center;
-            margin-top: 40px;
-            color: #666;
-            box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1);
-        }}
-
-        .empty-state {{
-            background: rgba(255, 255, 255, 0.9);
-            backdrop-filter: blur(10px);
-            border-radius: 15px;
-            padding: 40px;
-            text-align: center;
-            color: #666;
-            box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1);
-        }}
-
-        @media (max-width: 768px) {{
-            .container {{ padding: 10px; }}
-            .header {{ padding: 20px; }}
-            .header h1 {{ font-size: 2rem; }}
-            .controls {{ flex-direction: column; }}
-            .grant {{ padding: 20px; }}
-            .grant-meta {{ flex-direction: column; gap: 10px; }}
-            .deadline {{ flex-direction: column; align-items: flex-start; gap: 5px; }}
-        }}
-    </style>
+    <link rel="stylesheet" href="styles.css">
 </head>
 <body>
     <div class="container">
         <div class="header">
             <h1>💰 Grant Deadline Tracker</h1>
-            <p class="subtitle">Never miss a funding opportunity • Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}</p>
+            <p class="subtitle">Never miss a funding opportunity • Last updated: {now.strftime('%Y-%m-%d %H:%M UTC')}</p>
             <div class="stats">
                 <div class="stat">
                     <div class="stat-number">{len(urgent_grants)}</div>
@@ -875,49 +1177,49 @@ class GrantTracker:
             <a href="grants_feed.xml" class="rss-link">📡 RSS Feed</a>
         </div>
 
-        <div id="grantsContainer">"""
+        <div id="grantsContainer">""")
 
         # Add urgent grants section
         if urgent_grants:
-            html += f"""
+            out.write(f"""
             <div class="section" data-section="urgent">
                 <div class="section-header urgent">
                     🚨 Urgent Deadlines ({len(urgent_grants)} grants)
                     <span style="font-size: 0.9rem; font-weight: normal;">≤90 days remaining</span>
                 </div>
-                {self.render_grants_html(urgent_grants, 'urgent')}
-            </div>"""
+                {self.render_grants_html(urgent_grants, 'urgent', now)}
+            </div>""")
 
         # Add upcoming grants section
         if upcoming_grants:
-            html += f"""
+            out.write(f"""
             <div class="section" data-section="upcoming">
                 <div class="section-header upcoming">
                     ⏰ Upcoming Deadlines ({len(upcoming_grants)} grants)
                     <span style="font-size: 0.9rem; font-weight: normal;">3-6 months</span>
                 </div>
-                {self.render_grants_html(upcoming_grants, 'upcoming')}
-            </div>"""
+                {self.render_grants_html(upcoming_grants, 'upcoming', now)}
+            </div>""")
 
         # Add future grants section
         if future_grants:
-            html += f"""
+            out.write(f"""
             <div class="section" data-section="future">
                 <div class="section-header future">
                     📅 Future Opportunities ({len(future_grants)} grants)
                     <span style="font-size: 0.9rem; font-weight: normal;">6+ months</span>
                 </div>
-                {self.render_grants_html(future_grants, 'future')}
-            </div>"""
+                {self.render_grants_html(future_grants, 'future', now)}
+            </div>""")
 
         if not sorted_grants:
-            html += """
+            out.write("""
             <div class="empty-state">
                 <h3>No grants found</h3>
                 <p>Check your research areas configuration or try again later.</p>
-            </div>"""
+            </div>""")
 
-        html += """
+        out.write("""
         </div>
 
         <div class="footer">
@@ -927,204 +1229,118 @@ class GrantTracker:
         </div>
     </div>
 
-    <script>
-        // Search functionality
-        const searchInput = document.getElementById('searchInput');
-        const grantsContainer = document.getElementById('grantsContainer');
-        const allGrants = document.querySelectorAll('.grant');
-        const filterButtons = document.querySelectorAll('.filter-btn');
-
-        let currentFilter = 'all';
-
-        searchInput.addEventListener('input', function() {
-            filterGrants();
-        });
-
-        filterButtons.forEach(btn => {
-            btn.addEventListener('click', function() {
-                filterButtons.forEach(b => b.classList.remove('active'));
-                this.classList.add('active');
-                currentFilter = this.getAttribute('data-filter');
-                filterGrants();
-            });
-        });
-
-        function filterGrants() {
-            const searchTerm = searchInput.value.toLowerCase();
-
-            allGrants.forEach(grant => {
-                const searchableText = grant.getAttribute('data-searchable');
-                const grantSection = grant.getAttribute('data-urgency');
-
-                const matchesSearch = searchableText.includes(searchTerm);
-                const matchesFilter = currentFilter === 'all' || grantSection === currentFilter;
-
-                grant.style.display = (matchesSearch && matchesFilter) ? 'block' : 'none';
-            });
-
-            // Show/hide sections based on visible grants
-            document.querySelectorAll('.section').forEach(section => {
-                const sectionType = section.getAttribute('data-section');
-                const visibleGrants = section.querySelectorAll('.grant[style*="block"], .grant:not([style*="none"])');
-
-                if (currentFilter === 'all' || currentFilter === sectionType) {
-                    section.style.display = visibleGrants.length > 0 ? 'block' : 'none';
-                } else {
-                    section.style.display = 'none';
-                }
-            });
-        }
-
-        // Auto-update countdowns
-        function updateCountdowns() {
-            document.querySelectorAll('.deadline-countdown').forEach(countdown => {
-                const deadlineStr = countdown.getAttribute('data-deadline');
-                const deadline = new Date(deadlineStr);
-                const now = new Date();
-                const diffTime = deadline - now;
-                const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24));
-
-                if (diffDays <= 0) {
-                    countdown.textContent = 'EXPIRED';
-                    countdown.className = 'deadline-countdown countdown-critical';
-                } else if (diffDays <= 30) {
-                    countdown.textContent = diffDays + ' days';
-                    countdown.className = 'deadline-countdown countdown-critical';
-                } else if (diffDays <= 90) {
-                    countdown.textContent = diffDays + ' days';
-                    countdown.className = 'deadline-countdown countdown-warning';
-                } else {
-                    countdown.textContent = diffDays + ' days';
-                    countdown.className = 'deadline-countdown countdown-ok';
-                }
-            });
-        }
-
-        // Update countdowns every minute
-        updateCountdowns();
-        setInterval(updateCountdowns, 60000);
-    </script>
+    <script defer src="app.js"></script>
 </body>
-</html>"""
-
-        return html
+</html>""")
 
-    def render_grants_html(self, grants, urgency_class):
+    def render_grants_html(self, grants, urgency_class, now):
         """Render HTML for a list of grants"""
-        html = ""
+        # Collect fragments and join once at the end; += on strings
+        # re-copies the accumulated page for every grant
+        parts = []
 
         for grant in grants:
-            amount_str = ""
-            if grant.get('amounts'):
-                min_amount = min(grant['amounts'])
-                max_amount = max(grant['amounts'])
-                if min_amount == max_amount:
-                    amount_str = f"${min_amount:,}"
-                else:
-                    amount_str = f"${min_amount:,} - ${max_amount:,}"
+            amount_str = grant['_amount_str']
 
             deadlines_html = ""
             if grant.get('deadlines'):
-                deadlines_html = '<div class="deadlines"><strong>📅 Deadlines:</strong>'
-                for deadline in sorted(grant['deadlines']):
-                    days_until = (deadline - datetime.now()).days
-                    deadline_str = deadline.strftime('%B %d, %Y')
-                    deadlines_html += f"""
+                deadline_parts = ['<div class="deadlines"><strong>📅 Deadlines:</strong>']
+                # Deadlines were sorted once in run()
+                for deadline in grant['deadlines']:
+                    days_until = (deadline - now).days
+                    deadline_str = format_long_date(deadline)
+                    # Emit the final countdown class server-side; the JS
+                    # only has to maintain it across 30/90-day boundaries
+                    countdown_class = ('countdown-critical' if days_until <= 30
+                                       else 'countdown-warning' if days_until <= 90
+                                       else 'countdown-ok')
+                    deadline_parts.append(f"""
                     <div class="deadline">
                         <span class="deadline-date">{deadline_str}</span>
-                        <span class="deadline-countdown" data-deadline="{deadline.isoformat()}">{days_until} days</span>
-                    </div>"""
-                deadlines_html += '</div>'
+                        <span class="deadline-countdown {countdown_class}" data-deadline="{deadline.isoformat()}" data-last-days="{days_until}">{days_until} days</span>
+                    </div>""")
+                deadline_parts.append('</div>')
+                deadlines_html = ''.join(deadline_parts)
 
             eligibility_html = ""
             if grant.get('eligibility'):
-                eligibility_html = '<div class="eligibility">'
-                for tag in grant['eligibility']:
-                    eligibility_html += f'<span class="eligibility-tag">{tag}</span>'
-                eligibility_html += '</div>'
-
-            searchable_text = (grant['title'] + ' ' + grant['agency'] + ' ' +
-                             grant.get('description', '')).lower()
-
-            html += f"""
-            <div class="grant {urgency_class}" data-urgency="{urgency_class}"
-                 data-searchable="{searchable_text}">
-                <div class="grant-title">
-                    <a href="{grant['url']}" target="_blank">{grant['title']}</a>
-                </div>
-                <div class="grant-meta">
-                    <div class="agency">🏛️ {grant['agency']}</div>
-                    {f'<div class="amount">💰 {amount_str}</div>' if amount_str else ''}
-                </div>
-                <div class="description">{grant.get('description', 'No description available.')}</div>
-                {deadlines_html}
-                {eligibility_html}
-            </div>"""
-
-        return html
-
-    def generate_rss_feed(self):
+                eligibility_html = ''.join(
+                    ['<div class="eligibility">'] +
+                    [f'<span class="eligibility-tag">{tag}</span>'
+                     for tag in grant['eligibility']] +
+                    ['</div>']
+                )
+
+            # Scraped fields go through escape so a title or description
+            # containing < or " cannot break out of the card markup
+            parts.append(GRANT_CARD_TEMPLATE.format(
+                urgency_class=urgency_class,
+                searchable_text=grant['_searchable'],
+                url=escape(grant['url'], quote=True),
+                title=escape(grant['title']),
+                agency=escape(grant['agency']),
+                amount_html=(f'<div class="amount">💰 {amount_str}</div>'
+                             if amount_str else ''),
+                description=escape(grant.get('description', 'No description available.')),
+                deadlines_html=deadlines_html,
+                eligibility_html=eligibility_html
+            ))
+
+        return ''.join(parts)
+
+    def generate_rss_feed(self, out, now):
         """Generate RSS feed for grant deadlines"""
         # Sort by urgency and deadline
         sorted_grants = sorted(self.grants,
-                             key=lambda x: (x.get('urgency', 0), min(x.get('deadlines', [datetime.max]))),
+                             key=itemgetter('urgency', '_min_deadline'),
                              reverse=True)
 
-        rss_xml = f"""<?xml version="1.0" encoding="UTF-8"?>
+        out.write(f"""<?xml version="1.0" encoding="UTF-8"?>
 <rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
 <channel>
     <title>💰 Grant Deadline Tracker</title>
     <description>Automated tracking of neuroscience funding opportunities and deadlines</description>
-    <link>https://{os.getenv('GITHUB_REPOSITORY', 'username/repo').split('/')[0]}.github.io/{os.getenv('GITHUB_REPOSITORY', 'username/repo').split('/')[1]}/</link>
-    <atom:link href="https://{os.getenv('GITHUB_REPOSITORY', 'username/repo').split('/')[0]}.github.io/{os.getenv('GITHUB_REPOSITORY', 'username/repo').split('/')[1]}/grants_feed.xml" rel="self" type="application/rss+xml"/>
-    <lastBuildDate>{datetime.now().strftime('%a, %d %b %Y %H:%M:%S +0000')}</lastBuildDate>
+    <link>{self.pages_url}</link>
+    <atom:link href="{self.pages_url}grants_feed.xml" rel="self" type="application/rss+xml"/>
+    <lastBuildDate>{now.strftime('%a, %d %b %Y %H:%M:%S +0000')}</lastBuildDate>
     <language>en-us</language>
     <generator>GitHub Actions Grant Deadline Tracker</generator>
-"""
+""")
 
         for grant in sorted_grants[:30]:  # Latest 30 grants
             urgency_emoji = "🚨" if grant.get('urgency', 0) >= 4 else "⏰" if grant.get('urgency', 0) >= 2 else "📅"
 
             deadlines_text = ""
             if grant.get('deadlines'):
-                deadline_list = [d.strftime('%B %d, %Y') for d in grant['deadlines']]
+                deadline_list = [format_long_date(d) for d in grant['deadlines']]
                 deadlines_text = "Deadlines: " + ", ".join(deadline_list)
 
-            amounts_text = ""
-            if grant.get('amounts'):
-                min_amount = min(grant['amounts'])
-                max_amount = max(grant['amounts'])
-                if min_amount == max_amount:
-                    amounts_text = f"Award: ${min_amount:,}"
-                else:
-                    amounts_text = f"Award: ${min_amount:,} - ${max_amount:,}"
-
-            # Clean for XML
-            clean_title = grant['title'].replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-            clean_description = grant.get('description', '').replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-
-            pub_date = grant.get('last_updated', datetime.now()).strftime('%a, %d %b %Y %H:%M:%S +0000')
-
-            rss_xml += f"""
-    <item>
-        <title>{urgency_emoji} {clean_title}</title>
-        <description><![CDATA[
-            <p><strong>Agency:</strong> {grant['agency']}</p>
-            {f'<p><strong>{amounts_text}</strong></p>' if amounts_text else ''}
-            {f'<p><strong>{deadlines_text}</strong></p>' if deadlines_text else ''}
-            <hr>
-            <p>{clean_description}</p>
-        ]]></description>
-        <link>{grant['url']}</link>
-        <guid>{hash(grant['title'] + grant['agency'])}</guid>
-        <pubDate>{pub_date}</pubDate>
-    </item>"""
-
-        rss_xml += """
+            amounts_text = (f"Award: {grant['_amount_str']}"
+                            if grant['_amount_str'] else "")
+
+            # Clean for XML in one C-level pass instead of three chained replaces
+            clean_title = escape(grant['title'], quote=False)
+            clean_description = escape(grant.get('description', ''), quote=False)
+
+            pub_date = (grant.get('last_updated') or now).strftime('%a, %d %b %Y %H:%M:%S +0000')
+
+            out.write(RSS_ITEM_TEMPLATE.format(
+                urgency_emoji=urgency_emoji,
+                title=clean_title,
+                agency=grant['agency'],
+                amounts_html=(f'<p><strong>{amounts_text}</strong></p>'
+                              if amounts_text else ''),
+                deadlines_html=(f'<p><strong>{deadlines_text}</strong></p>'
+                                if deadlines_text else ''),
+                description=clean_description,
+                url=grant['url'],
+                guid=grant['_guid'],
+                pub_date=pub_date
+            ))
+
+        out.write("""
 </channel>
-</rss>"""
-
-        return rss_xml
+</rss>""")
 
     def run(self):
         """Main execution function"""
@@ -1135,8 +1351,9 @@ class GrantTracker:
             existing_grants = self.load_existing_grants()
             # Only keep grants updated in the last 7 days to force refresh of old data
             week_ago = datetime.now() - timedelta(days=7)
+            _MIN = datetime.min
             self.grants = [g for g in existing_grants
-                          if g.get('last_updated', datetime.min) > week_ago]
+                          if (g.get('last_updated') or _MIN) > week_ago]
             print(f"Loaded {len(self.grants)} existing grants")
 
         # Scrape new data
@@ -1145,58 +1362,94 @@ class GrantTracker:
         self.scrape_nsf_grants()
         self.scrape_foundation_grants()
 
-        # Remove duplicates based on title and agency
+        # Remove duplicates based on title and agency. The normalized key
+        # is cached on the grant (and survives the JSON round trip), so
+        # each title/agency pair is lowercased at most once ever
         unique_grants = {}
         for grant in self.grants:
-            key = (grant['title'].lower().strip(), grant['agency'].lower())
-            if key not in unique_grants or grant.get('last_updated', datetime.min) > unique_grants[key].get('last_updated', datetime.min):
+            key = grant.get('_dedup_key')
+            if key is None:
+                key = f"{grant['title'].strip().lower()}|{grant['agency'].lower()}"
+                grant['_dedup_key'] = key
+            current = unique_grants.get(key)
+            if current is None or grant.get('last_updated', datetime.min) > current.get('last_updated', datetime.min):
                 unique_grants[key] = grant
 
         self.grants = list(unique_grants.values())
         print(f"Total unique grants found: {len(self.grants)}")
 
-        # Calculate urgency for all grants
+        # One pass sorts each grant's deadlines and computes its nearest
+        # deadline and urgency; every later sort and render reads the
+        # cached values
+        now = datetime.now()
         for grant in self.grants:
-            grant['urgency'] = self.calculate_urgency(grant)
-
-        # Generate website and RSS
-        print("Generating website...")
-        html_content = self.generate_html_website()
-
-        print("Generating RSS feed...")
-        rss_content = self.generate_rss_feed()
+            grant['deadlines'] = sorted(grant.get('deadlines', []))
+            if grant['deadlines']:
+                grant['_min_deadline'] = grant['deadlines'][0]
+                grant['urgency'] = self.calculate_urgency(
+                    (grant['_min_deadline'] - now).days
+                )
+            else:
+                grant['_min_deadline'] = datetime.max
+                grant['urgency'] = 0
+            amounts = grant.get('amounts')
+            if amounts:
+                lo, hi = min(amounts), max(amounts)
+                grant['_amount_str'] = (f"${lo:,}" if lo == hi
+                                        else f"${lo:,} - ${hi:,}")
+            else:
+                grant['_amount_str'] = ''
+            # Escaped for safe embedding in the data-searchable attribute;
+            # a stray quote in a title would otherwise truncate the card
+            grant['_searchable'] = escape(
+                (grant['title'] + ' ' + grant['agency'] + ' ' +
+                 grant.get('description', '')).lower(),
+                quote=True
+            )
+            if '_guid' not in grant:
+                # Stable across runs, unlike the builtin hash() which is
+                # randomized per process and re-notified every RSS reader
+                grant['_guid'] = hashlib.blake2b(
+                    f"{grant['title']}|{grant['agency']}".encode(),
+                    digest_size=8
+                ).hexdigest()
 
         # Save everything
         self.save_grants()
 
-        # Write HTML file
-        with open('grant_docs/index.html', 'w') as f:
-            f.write(html_content)
+        # Write the static stylesheet and script alongside the page
+        with open('grant_docs/styles.css', 'w') as f:
+            f.write(SITE_CSS)
+        with open('grant_docs/app.js', 'w') as f:
+            f.write(SITE_JS)
+
+        # Stream the website and RSS straight to their files so the full
+        # documents are never held in memory
+        print("Generating website...")
+        with open('grant_docs/index.html', 'w', buffering=1 << 20) as f:
+            self.generate_html_website(f, now)
 
-        # Write RSS feed
-        with open('grant_docs/grants_feed.xml', 'w') as f:
-            f.write(rss_content)
+        print("Generating RSS feed...")
+        with open('grant_docs/grants_feed.xml', 'w', buffering=1 << 20) as f:
+            self.generate_rss_feed(f, now)
 
         # Generate a simple calendar view
         self.generate_calendar_view()
 
         print("Grant tracking complete!")
-        print(f"Website will be available at: https://{os.getenv('GITHUB_REPOSITORY', 'username/repo').split('/')[0]}.github.io/{os.getenv('GITHUB_REPOSITORY', 'username/repo').split('/')[1]}/")
+        print(f"Website will be available at: {self.pages_url}")
 
     def generate_calendar_view(self):
         """Generate a calendar view of upcoming deadlines"""
-        # Group deadlines by month
-        deadlines_by_month = {}
+        # Group deadlines by month; tuples are lighter than per-entry
+        # dicts and defaultdict avoids the double lookup per deadline
+        deadlines_by_month = defaultdict(list)
 
         for grant in self.grants:
-            for deadline in grant.get('deadlines', []):
-                month_key = deadline.strftime('%Y-%m')
-                if month_key not in deadlines_by_month:
-                    deadlines_by_month[month_key] = []
-                deadlines_by_month[month_key].append({
-                    'date': deadline,
-                    'grant': grant
-                })
+            for deadline in grant.get('deadlines', ()):
+                deadlines_by_month[f"{deadline.year}-{deadline.month:02d}"].append(
+                    (deadline, grant)
+                )
 
         # Generate simple calendar HTML
         calendar_html = """<!DOCTYPE html>
@@ -1216,22 +1469,22 @@ class GrantTracker:
     <h1>📅 Grant Deadlines Calendar</h1>
 """
 
-        for month_key in sorted(deadlines_by_month.keys()):
-            month_name = datetime.strptime(month_key, '%Y-%m').strftime('%B %Y')
+        for month_key, month_deadlines in sorted(deadlines_by_month.items()):
+            year, _, month = month_key.partition('-')
+            month_name = f"{_MONTHS[int(month) - 1]} {year}"
             calendar_html += f"""
     <div class="month">
         <div class="month-header">{month_name}</div>
 """
 
             # Sort deadlines by date
-            month_deadlines = sorted(deadlines_by_month[month_key], key=lambda x: x['date'])
+            month_deadlines.sort(key=itemgetter(0))
 
-            for item in month_deadlines:
-                deadline_str = item['date'].strftime('%d')
+            for deadline, grant in month_deadlines:
                 calendar_html += f"""
         <div class="deadline-item">
-            <span class="deadline-date">{deadline_str}</span>
-            <span class="grant-title">{item['grant']['title']} ({item['grant']['agency']})</span>
+            <span class="deadline-date">{deadline.day:02d}</span>
+            <span class="grant-title">{grant['title']} ({grant['agency']})</span>
         </div>"""
 
             calendar_html += "</div>"
@@ -4,17 +4,110 @@ Literature Review Alert System - GitHub Pages Version
 Searches PubMed for recent papers and generates a website + RSS feed
 """
 
+import gzip
+import hashlib
+import io
 import os
+import sqlite3
 import sys
 import requests
 import json
 from datetime import datetime, timedelta
+from functools import lru_cache
+from html import escape
+from itertools import chain, groupby, islice
+from operator import itemgetter
 from urllib.parse import quote
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# lxml's iterparse is the fastest streaming parser, but PubMed XML has
+# no namespaces so the stdlib C parser is a drop-in fallback
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+# An API key raises NCBI's rate cap from 3 to 10 requests per second;
+# the limiter spaces out request starts so concurrent workers stay
+# under whichever cap applies
+NCBI_API_KEY = os.getenv('NCBI_API_KEY')
+NCBI_EMAIL = os.getenv('NCBI_EMAIL')
+_REQUEST_INTERVAL = 0.11 if NCBI_API_KEY else 0.34
+_throttle_lock = threading.Lock()
+_next_request_at = 0.0
+
+# One session shared by every request keeps the TLS connection to
+# eutils alive across calls and retries transient failures (NCBI
+# answers bursts with 429) with exponential backoff
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    max_retries=Retry(total=5, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['GET']),
+    pool_connections=4,
+    pool_maxsize=10,
+))
+
+
+def ncbi_params(params):
+    """Add the identification parameters NCBI asks every client to send"""
+    params['tool'] = 'lit-review'
+    if NCBI_EMAIL:
+        params['email'] = NCBI_EMAIL
+    if NCBI_API_KEY:
+        params['api_key'] = NCBI_API_KEY
+    return params
+
+
+def throttle_ncbi():
+    """Block until the next NCBI request slot is free"""
+    global _next_request_at
+    with _throttle_lock:
+        now = time.monotonic()
+        wait = _next_request_at - now
+        _next_request_at = max(now, _next_request_at) + _REQUEST_INTERVAL
+    if wait > 0:
+        time.sleep(wait)
+
+def keyword_terms(keywords):
+    """Flatten keyword sets into the individual search terms worth scoring"""
+    return frozenset(
+        term
+        for keyword_set in keywords
+        for term in keyword_set.lower().replace('(', '').replace(')', '')
+                               .replace(' and ', ' ').replace(' or ', ' ').split()
+        if len(term) > 2  # Skip very short terms
+    )
+
+
+def build_keyword_automaton(terms):
+    """Build an Aho-Corasick automaton over the search terms, or None.
+
+    One automaton pass counts every term in a paper's text instead of
+    one substring scan per term; requires the pyahocorasick extension.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
 
-def search_pubmed(keywords, days_back=1):
-    """Search PubMed for recent papers matching keywords"""
+def search_pubmed(keywords, days_back=1, known_pmids=frozenset()):
+    """Search PubMed for recent papers matching keywords.
+
+    PMIDs in known_pmids are already in the local store; their records
+    are immutable, so they are dropped before the efetch round trips.
+    """
     base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
 
     # Calculate date range
@@ -23,43 +116,55 @@ def search_pubmed(keywords, days_back=1):
 
     date_filter = f"{start_date.strftime('%Y/%m/%d')}:{end_date.strftime('%Y/%m/%d')}[pdat]"
 
-    results = []
+    search_url = f"{base_url}esearch.fcgi"
 
-    for keyword_set in keywords:
+    def search_one(keyword_set):
         print(f"Searching for: {keyword_set}")
 
         # Build search query
         query = f"({keyword_set}) AND {date_filter}"
 
-        # Search for paper IDs
-        search_url = f"{base_url}esearch.fcgi"
-        search_params = {
+        search_params = ncbi_params({
             'db': 'pubmed',
             'term': query,
             'retmax': 20,  # Limit to most recent 20 papers per keyword set
             'sort': 'pub_date',
             'retmode': 'json'
-        }
-
-        try:
-            search_response = requests.get(search_url, params=search_params, timeout=30)
-            search_data = search_response.json()
-
-            if 'esearchresult' in search_data and 'idlist' in search_data['esearchresult']:
-                paper_ids = search_data['esearchresult']['idlist']
-
-                if paper_ids:
-                    # Get paper details
-                    papers = fetch_paper_details(paper_ids)
-                    for paper in papers:
-                        paper['search_term'] = keyword_set
-                    results.extend(papers)
-
-        except Exception as e:
-            print(f"Error searching for {keyword_set}: {e}")
-
-        # Be nice to NCBI servers
-        time.sleep(0.5)
+        })
+
+        throttle_ncbi()
+        search_response = session.get(search_url, params=search_params, timeout=30)
+        search_data = search_response.json()
+        return search_data.get('esearchresult', {}).get('idlist', [])
+
+    # Pass 1: the searches are independent HTTP round trips, so run
+    # them concurrently; throttle_ncbi keeps the request rate polite.
+    # Collect which keyword sets hit each PMID so overlapping hits are
+    # fetched only once
+    terms_by_pmid = {}
+    with ThreadPoolExecutor(max_workers=min(8, len(keywords))) as executor:
+        futures = {executor.submit(search_one, kw): kw for kw in keywords}
+        for future in as_completed(futures):
+            keyword_set = futures[future]
+            try:
+                paper_ids = future.result()
+            except Exception as e:
+                print(f"Error searching for {keyword_set}: {e}")
+                continue
+            for pmid in paper_ids:
+                terms_by_pmid.setdefault(pmid, []).append(keyword_set)
+
+    # Pass 2: fetch details in batches of 200 IDs instead of one efetch
+    # per keyword set, skipping papers fetched on a previous run
+    results = []
+    pmids = [pmid for pmid in terms_by_pmid if pmid not in known_pmids]
+    if len(pmids) < len(terms_by_pmid):
+        print(f"Skipping {len(terms_by_pmid) - len(pmids)} already-stored papers")
+    for start in range(0, len(pmids), 200):
+        papers = fetch_paper_details(pmids[start:start + 200])
+        for paper in papers:
+            paper['search_term'] = '; '.join(terms_by_pmid.get(paper.get('pmid'), []))
+        results.extend(papers)
 
     return results
 
@@ -69,62 +174,62 @@ def fetch_paper_details(paper_ids):
 
     # Get detailed info
     fetch_url = f"{base_url}efetch.fcgi"
-    fetch_params = {
+    fetch_params = ncbi_params({
         'db': 'pubmed',
         'id': ','.join(paper_ids),
         'retmode': 'xml'
-    }
+    })
 
     papers = []
 
     try:
-        response = requests.get(fetch_url, params=fetch_params, timeout=30)
-
-        # Simple XML parsing for key fields
-        xml_content = response.text
-
-        # Split by articles (basic approach)
-        articles = xml_content.split('<PubmedArticle>')
-
-        for article in articles[1:]:  # Skip first empty split
-            paper = extract_paper_info(article)
+        throttle_ncbi()
+        response = session.get(fetch_url, params=fetch_params, timeout=30)
+
+        # Stream the response through a C-level XML parser, one article
+        # element at a time, instead of regex scans over the full text
+        for _, elem in ET.iterparse(io.BytesIO(response.content), events=('end',)):
+            if elem.tag != 'PubmedArticle':
+                continue
+            paper = extract_paper_info(elem)
             if paper:
                 papers.append(paper)
+            elem.clear()
 
     except Exception as e:
         print(f"Error fetching paper details: {e}")
 
     return papers
 
-def extract_paper_info(article_xml):
-    """Extract key information from article XML"""
+def extract_paper_info(article):
+    """Extract key information from a parsed PubmedArticle element"""
     try:
-        # Basic regex-like extraction (simple but effective)
-        import re
-
         # Extract title
-        title_match = re.search(r'<ArticleTitle>(.*?)</ArticleTitle>', article_xml, re.DOTALL)
-        title = title_match.group(1).strip() if title_match else "Title not found"
+        title = (article.findtext('.//ArticleTitle') or "Title not found").strip()
 
         # Extract authors (first few)
-        author_pattern = r'<LastName>(.*?)</LastName>.*?<ForeName>(.*?)</ForeName>'
-        authors = re.findall(author_pattern, article_xml)
-        author_str = ", ".join([f"{first} {last}" for last, first in authors[:3]])
+        authors = []
+        for author in article.findall('.//Author'):
+            last = author.findtext('LastName')
+            first = author.findtext('ForeName')
+            if last and first:
+                authors.append(f"{first} {last}")
+        author_str = ", ".join(authors[:3])
         if len(authors) > 3:
             author_str += " et al."
 
         # Extract journal
-        journal_match = re.search(r'<Title>(.*?)</Title>', article_xml)
-        journal = journal_match.group(1) if journal_match else "Journal not found"
+        journal = article.findtext('.//Journal/Title') or "Journal not found"
 
         # Extract PMID
-        pmid_match = re.search(r'<PMID.*?>(.*?)</PMID>', article_xml)
-        pmid = pmid_match.group(1) if pmid_match else None
+        pmid = article.findtext('.//PMID')
 
         # Extract publication date
-        pub_date_match = re.search(r'<PubDate>.*?<Year>(\d{4})</Year>.*?<Month>(\w+)</Month>.*?<Day>(\d+)</Day>', article_xml, re.DOTALL)
-        if pub_date_match:
-            year, month_name, day = pub_date_match.groups()
+        pub_elem = article.find('.//PubDate')
+        year = pub_elem.findtext('Year') if pub_elem is not None else None
+        month_name = pub_elem.findtext('Month') if pub_elem is not None else None
+        day = pub_elem.findtext('Day') if pub_elem is not None else None
+        if year and month_name and day:
             # Convert month name to number
             month_map = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
                         'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
@@ -133,13 +238,9 @@ def extract_paper_info(article_xml):
         else:
             pub_date = datetime.now().strftime('%Y-%m-%d')
 
-        # Extract abstract
-        abstract_match = re.search(r'<AbstractText.*?>(.*?)</AbstractText>', article_xml, re.DOTALL)
-        abstract = abstract_match.group(1).strip() if abstract_match else "Abstract not available"
-
-        # Clean up HTML entities
-        title = title.replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
-        abstract = abstract.replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
+        # Extract abstract; the parser has already decoded XML entities
+        abstract = article.findtext('.//AbstractText')
+        abstract = abstract.strip() if abstract else "Abstract not available"
 
         return {
             'title': title,
@@ -155,218 +256,319 @@ def extract_paper_info(article_xml):
         print(f"Error extracting paper info: {e}")
         return None
 
-def calculate_relevance_score(paper, keywords):
-    """Simple relevance scoring based on keyword matches"""
-    text_to_check = (paper['title'] + ' ' + paper['abstract']).lower()
+def calculate_relevance_score(paper, terms, automaton=None):
+    """Simple relevance scoring based on keyword matches.
+
+    terms is the flattened frozenset from keyword_terms, computed once
+    per run rather than re-split from the keyword sets for every paper.
+    """
+    text_to_check = f"{paper['title']} {paper['abstract']}".lower()
 
     score = 0
     matched_terms = []
 
-    for keyword_set in keywords:
-        keyword_terms = keyword_set.lower().replace('(', '').replace(')', '').replace(' and ', ' ').replace(' or ', ' ').split()
-        for term in keyword_terms:
-            if len(term) > 2 and term in text_to_check:  # Skip very short terms
-                score += text_to_check.count(term)
-                if term not in matched_terms:
-                    matched_terms.append(term)
+    if automaton is not None:
+        # Single pass over the text tallies every term at once
+        counts = {}
+        for _, term in automaton.iter(text_to_check):
+            counts[term] = counts.get(term, 0) + 1
+        score = sum(counts.values())
+        matched_terms = list(counts)
+    else:
+        count = text_to_check.count
+        for term in terms:
+            hits = count(term)
+            if hits:
+                score += hits
+                matched_terms.append(term)
 
     paper['relevance_score'] = score
     paper['matched_terms'] = matched_terms
     return paper
 
-def load_historical_data():
-    """Load historical papers from JSON file"""
-    try:
-        with open('docs/papers.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
+# Column order shared by the papers table, its upserts, and row unpacking
+PAPER_COLUMNS = ('pmid', 'pub_date', 'title', 'authors', 'journal', 'abstract',
+                 'relevance_score', 'matched_terms', 'search_term', 'url')
+
 
-def save_papers_data(papers):
-    """Save all papers to JSON file"""
+def open_papers_db():
+    """Open (and create if needed) the SQLite paper store"""
     os.makedirs('docs', exist_ok=True)
-    with open('docs/papers.json', 'w') as f:
-        json.dump(papers, f, indent=2, default=str)
+    conn = sqlite3.connect('docs/papers.db')
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS papers ('
+        'pmid TEXT PRIMARY KEY, pub_date TEXT, title TEXT, authors TEXT, '
+        'journal TEXT, abstract TEXT, relevance_score INTEGER, '
+        'matched_terms TEXT, search_term TEXT, url TEXT)'
+    )
+    return conn
 
-def generate_main_html(papers):
-    """Generate main HTML page"""
 
-    # Group papers by date
-    papers_by_date = {}
-    for paper in papers:
-        date = paper['pub_date']
-        if date not in papers_by_date:
-            papers_by_date[date] = []
-        papers_by_date[date].append(paper)
+def paper_to_row(paper):
+    """Flatten a paper dict into a tuple in PAPER_COLUMNS order"""
+    # Unscored papers store 0, not NULL, so scores always sort as ints
+    row = dict(paper,
+               matched_terms=json.dumps(paper.get('matched_terms', [])),
+               relevance_score=paper.get('relevance_score') or 0)
+    return tuple(row.get(col) for col in PAPER_COLUMNS)
 
-    # Sort dates (newest first)
-    sorted_dates = sorted(papers_by_date.keys(), reverse=True)
 
-    repo_name = os.getenv('REPO_NAME', 'your-repo').split('/')[-1]
+# Per-process state for scoring workers; each worker rebuilds the
+# automaton once from the terms it is initialized with
+_worker_state = {}
+
+
+def _init_score_worker(terms):
+    _worker_state['terms'] = terms
+    _worker_state['automaton'] = build_keyword_automaton(terms)
+
+
+def _score_one(paper):
+    return calculate_relevance_score(paper, _worker_state['terms'],
+                                     _worker_state['automaton'])
+
+
+def score_papers(papers, terms, automaton=None):
+    """Score papers serially, or across processes for large batches.
+
+    Scoring is independent per paper, so big backfills fan out to a
+    Pool; below the threshold the worker startup would cost more than
+    it saves.
+    """
+    if len(papers) < 200:
+        return [calculate_relevance_score(p, terms, automaton) for p in papers]
+    from multiprocessing import Pool
+    with Pool(initializer=_init_score_worker, initargs=(terms,)) as pool:
+        return pool.map(_score_one, papers, chunksize=64)
 
-    html = f"""<!DOCTYPE html>
+
+def load_historical_data():
+    """Load historical papers from the SQLite store.
+
+    A legacy docs/papers.json from earlier versions is migrated into the
+    database once and then ignored.
+    """
+    conn = open_papers_db()
+    try:
+        if conn.execute('SELECT 1 FROM papers LIMIT 1').fetchone() is None:
+            migrate_papers_json(conn)
+        papers = []
+        for row in conn.execute(f"SELECT {', '.join(PAPER_COLUMNS)} FROM papers"):
+            paper = dict(zip(PAPER_COLUMNS, row))
+            paper['matched_terms'] = json.loads(paper['matched_terms'] or '[]')
+            # Databases written before scores defaulted may hold NULLs
+            paper['relevance_score'] = paper['relevance_score'] or 0
+            papers.append(paper)
+        return papers
+    finally:
+        conn.close()
+
+
+def migrate_papers_json(conn):
+    """Import the legacy JSON store into an empty database"""
+    try:
+        raw = Path('docs/papers.json').read_bytes()
+    except FileNotFoundError:
+        return
+    try:
+        import orjson
+        legacy = orjson.loads(raw)
+    except ImportError:
+        legacy = json.loads(raw)
+    print(f"Migrating {len(legacy)} papers from papers.json into papers.db")
+    save_papers_data(legacy, conn)
+
+
+def save_papers_data(papers, conn=None):
+    """Upsert papers into the SQLite store.
+
+    Only the rows passed in are written, so a run with a handful of new
+    papers costs a handful of inserts instead of rewriting the whole
+    history.
+    """
+    owned = conn is None
+    if owned:
+        conn = open_papers_db()
+    try:
+        placeholders = ', '.join('?' * len(PAPER_COLUMNS))
+        conn.executemany(
+            f"INSERT OR REPLACE INTO papers ({', '.join(PAPER_COLUMNS)}) "
+            f"VALUES ({placeholders})",
+            [paper_to_row(p) for p in papers if p.get('pmid')],
+        )
+        conn.commit()
+    finally:
+        if owned:
+            conn.close()
+
+SITE_CSS = """body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+    max-width: 1000px;
+    margin: 0 auto;
+    padding: 20px;
+    background: #fafafa;
+}
+.header {
+    text-align: center;
+    margin-bottom: 40px;
+    padding: 30px;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    border-radius: 10px;
+}
+.stats {
+    display: flex;
+    justify-content: center;
+    gap: 30px;
+    margin: 20px 0;
+    flex-wrap: wrap;
+}
+.stat {
+    background: rgba(255,255,255,0.2);
+    padding: 10px 20px;
+    border-radius: 20px;
+    font-weight: bold;
+}
+.date-section {
+    margin: 30px 0;
+    background: white;
+    border-radius: 10px;
+    overflow: hidden;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+}
+.date-header {
+    background: #4CAF50;
+    color: white;
+    padding: 15px 20px;
+    font-weight: bold;
+    font-size: 18px;
+}
+.paper {
+    border-bottom: 1px solid #eee;
+    padding: 20px;
+    position: relative;
+}
+.paper:last-child { border-bottom: none; }
+.high-relevance {
+    border-left: 4px solid #FF5722;
+    background: linear-gradient(90deg, #fff5f5 0%, white 20%);
+}
+.medium-relevance {
+    border-left: 4px solid #FF9800;
+    background: linear-gradient(90deg, #fffbf0 0%, white 20%);
+}
+.low-relevance {
+    border-left: 4px solid #4CAF50;
+}
+.title {
+    font-size: 18px;
+    font-weight: bold;
+    color: #333;
+    margin-bottom: 8px;
+    line-height: 1.3;
+}
+.title a {
+    color: #333;
+    text-decoration: none;
+}
+.title a:hover {
+    color: #1976D2;
+    text-decoration: underline;
+}
+.authors {
+    color: #666;
+    font-style: italic;
+    margin: 5px 0;
+}
+.journal {
+    color: #2196F3;
+    font-weight: bold;
+    margin: 5px 0;
+}
+.abstract {
+    margin: 15px 0;
+    line-height: 1.5;
+    color: #444;
+}
+.metadata {
+    font-size: 13px;
+    color: #888;
+    display: flex;
+    flex-wrap: wrap;
+    gap: 15px;
+    align-items: center;
+}
+.matched-terms {
+    background: #FFE082;
+    padding: 2px 6px;
+    border-radius: 12px;
+    font-size: 11px;
+    font-weight: bold;
+}
+.relevance-badge {
+    position: absolute;
+    top: 15px;
+    right: 15px;
+    padding: 4px 8px;
+    border-radius: 12px;
+    font-size: 11px;
+    font-weight: bold;
+    color: white;
+}
+.high-score { background: #F44336; }
+.medium-score { background: #FF9800; }
+.low-score { background: #4CAF50; }
+.rss-link {
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    background: #FF6600;
+    color: white;
+    padding: 10px 15px;
+    border-radius: 20px;
+    text-decoration: none;
+    font-weight: bold;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.2);
+    z-index: 1000;
+}
+.rss-link:hover {
+    background: #E55A00;
+    transform: translateY(-2px);
+    transition: all 0.2s;
+}
+.search-box {
+    width: 100%;
+    max-width: 400px;
+    padding: 10px 15px;
+    border: 2px solid rgba(255,255,255,0.3);
+    border-radius: 25px;
+    background: rgba(255,255,255,0.2);
+    color: white;
+    font-size: 16px;
+    margin: 10px 0;
+}
+.search-box::placeholder {
+    color: rgba(255,255,255,0.8);
+}
+@media (max-width: 600px) {
+    .stats { flex-direction: column; align-items: center; }
+    .metadata { flex-direction: column; align-items: flex-start; }
+    .relevance-badge { position: static; margin-bottom: 10px; }
+}
+"""
+
+# Page skeleton and per-paper card, substituted with str.format so the
+# static markup is written once at import time rather than rebuilt from
+# f-string fragments on every call. A template engine would be overkill
+# for two fragments.
+PAGE_HEAD_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Literature Review - {repo_name}</title>
     <link rel="alternate" type="application/rss+xml" title="Literature Feed" href="feed.xml">
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            max-width: 1000px;
-            margin: 0 auto;
-            padding: 20px;
-            background: #fafafa;
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 40px;
-            padding: 30px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            border-radius: 10px;
-        }}
-        .stats {{
-            display: flex;
-            justify-content: center;
-            gap: 30px;
-            margin: 20px 0;
-            flex-wrap: wrap;
-        }}
-        .stat {{
-            background: rgba(255,255,255,0.2);
-            padding: 10px 20px;
-            border-radius: 20px;
-            font-weight: bold;
-        }}
-        .date-section {{
-            margin: 30px 0;
-            background: white;
-            border-radius: 10px;
-            overflow: hidden;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-        .date-header {{
-            background: #4CAF50;
-            color: white;
-            padding: 15px 20px;
-            font-weight: bold;
-            font-size: 18px;
-        }}
-        .paper {{
-            border-bottom: 1px solid #eee;
-            padding: 20px;
-            position: relative;
-        }}
-        .paper:last-child {{ border-bottom: none; }}
-        .high-relevance {{
-            border-left: 4px solid #FF5722;
-            background: linear-gradient(90deg, #fff5f5 0%, white 20%);
-        }}
-        .medium-relevance {{
-            border-left: 4px solid #FF9800;
-            background: linear-gradient(90deg, #fffbf0 0%, white 20%);
-        }}
-        .low-relevance {{
-            border-left: 4px solid #4CAF50;
-        }}
-        .title {{
-            font-size: 18px;
-            font-weight: bold;
-            color: #333;
-            margin-bottom: 8px;
-            line-height: 1.3;
-        }}
-        .title a {{
-            color: #333;
-            text-decoration: none;
-        }}
-        .title a:hover {{
-            color: #1976D2;
-            text-decoration: underline;
-        }}
-        .authors {{
-            color: #666;
-            font-style: italic;
-            margin: 5px 0;
-        }}
-        .journal {{
-            color: #2196F3;
-            font-weight: bold;
-            margin: 5px 0;
-        }}
-        .abstract {{
-            margin: 15px 0;
-            line-height: 1.5;
-            color: #444;
-        }}
-        .metadata {{
-            font-size: 13px;
-            color: #888;
-            display: flex;
-            flex-wrap: wrap;
-            gap: 15px;
-            align-items: center;
-        }}
-        .matched-terms {{
-            background: #FFE082;
-            padding: 2px 6px;
-            border-radius: 12px;
-            font-size: 11px;
-            font-weight: bold;
-        }}
-        .relevance-badge {{
-            position: absolute;
-            top: 15px;
-            right: 15px;
-            padding: 4px 8px;
-            border-radius: 12px;
-            font-size: 11px;
-            font-weight: bold;
-            color: white;
-        }}
-        .high-score {{ background: #F44336; }}
-        .medium-score {{ background: #FF9800; }}
-        .low-score {{ background: #4CAF50; }}
-        .rss-link {{
-            position: fixed;
-            top: 20px;
-            right: 20px;
-            background: #FF6600;
-            color: white;
-            padding: 10px 15px;
-            border-radius: 20px;
-            text-decoration: none;
-            font-weight: bold;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.2);
-            z-index: 1000;
-        }}
-        .rss-link:hover {{
-            background: #E55A00;
-            transform: translateY(-2px);
-            transition: all 0.2s;
-        }}
-        .search-box {{
-            width: 100%;
-            max-width: 400px;
-            padding: 10px 15px;
-            border: 2px solid rgba(255,255,255,0.3);
-            border-radius: 25px;
-            background: rgba(255,255,255,0.2);
-            color: white;
-            font-size: 16px;
-            margin: 10px 0;
-        }}
-        .search-box::placeholder {{
-            color: rgba(255,255,255,0.8);
-        }}
-        @media (max-width: 600px) {{
-            .stats {{ flex-direction: column; align-items: center; }}
-            .metadata {{ flex-direction: column; align-items: flex-start; }}
-            .relevance-badge {{ position: static; margin-bottom: 10px; }}
-        }}
-    </style>
+    <link rel="stylesheet" href="style.css">
 </head>
 <body>
     <a href="feed.xml" class="rss-link">📡 RSS Feed</a>
@@ -377,68 +579,32 @@ def generate_main_html(papers):
         <input type="text" class="search-box" id="searchBox" placeholder="Search papers...">
 
         <div class="stats">
-            <div class="stat">📚 {len(papers)} Total Papers</div>
-            <div class="stat">📅 {len(sorted_dates)} Days Tracked</div>
-            <div class="stat">🔥 {len([p for p in papers if p.get('relevance_score', 0) >= 5])} High Relevance</div>
-            <div class="stat">⚡ Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}</div>
+            <div class="stat">📚 {total_papers} Total Papers</div>
+            <div class="stat">📅 {days_tracked} Days Tracked</div>
+            <div class="stat">🔥 {high_count} High Relevance</div>
+            <div class="stat">⚡ Last Updated: {updated}</div>
         </div>
     </div>
 
     <div id="papersContainer">
 """
 
-    # Add papers grouped by date
-    for date in sorted_dates[:30]:  # Show last 30 days
-        papers_on_date = papers_by_date[date]
-        papers_sorted = sorted(papers_on_date, key=lambda x: x.get('relevance_score', 0), reverse=True)
-
-        html += f"""
-        <div class="date-section">
-            <div class="date-header">
-                📅 {date} ({len(papers_on_date)} papers)
-            </div>
-        """
-
-        for paper in papers_sorted:
-            relevance = paper.get('relevance_score', 0)
-
-            if relevance >= 5:
-                relevance_class = "high-relevance"
-                badge_class = "high-score"
-                badge_text = "🔥 HIGH"
-            elif relevance >= 2:
-                relevance_class = "medium-relevance"
-                badge_class = "medium-score"
-                badge_text = "⚡ MED"
-            else:
-                relevance_class = "low-relevance"
-                badge_class = "low-score"
-                badge_text = "✓ LOW"
-
-            # Truncate abstract for display
-            abstract_display = paper['abstract'][:300] + "..." if len(paper['abstract']) > 300 else paper['abstract']
-
-            paper_title = paper['title'] if paper.get('url') else paper['title']
-            title_html = f'<a href="{paper["url"]}" target="_blank">{paper_title}</a>' if paper.get('url') else paper_title
-
-            html += f"""
-            <div class="paper {relevance_class}" data-title="{paper['title'].lower()}" data-abstract="{paper['abstract'].lower()}">
+PAPER_CARD_TEMPLATE = """
+            <div class="paper {relevance_class}" data-pmid="{pmid}">
                 <div class="relevance-badge {badge_class}">{badge_text}</div>
                 <div class="title">{title_html}</div>
-                <div class="authors">{paper['authors']}</div>
-                <div class="journal">{paper['journal']}</div>
+                <div class="authors">{authors}</div>
+                <div class="journal">{journal}</div>
                 <div class="abstract">{abstract_display}</div>
                 <div class="metadata">
                     <span>Relevance: {relevance}</span>
-                    <span class="matched-terms">{', '.join(paper.get('matched_terms', []))}</span>
-                    <span>PMID: {paper.get('pmid', 'N/A')}</span>
+                    <span class="matched-terms">{matched_terms}</span>
+                    <span>PMID: {pmid}</span>
                 </div>
             </div>
             """
 
-        html += "</div>"
-
-    html += """
+PAGE_FOOT = """
     </div>
 
     <footer style="text-align: center; margin-top: 50px; padding: 20px; color: #666;">
@@ -446,27 +612,34 @@ def generate_main_html(papers):
         <p>Configure keywords in repository variables to customize your alerts</p>
     </footer>
 
+    <script src="https://cdn.jsdelivr.net/npm/minisearch@7/dist/umd/index.min.js"></script>
     <script>
-        // Simple search functionality
+        // Query a prebuilt MiniSearch index instead of substring-scanning
+        // every card's text on each keystroke
+        const mini = new MiniSearch({fields: ['title', 'abstract']});
+        let indexReady = false;
+        fetch('search_index.json')
+            .then(resp => resp.json())
+            .then(docs => { mini.addAll(docs); indexReady = true; });
+
         document.getElementById('searchBox').addEventListener('input', function(e) {
-            const searchTerm = e.target.value.toLowerCase();
+            const query = e.target.value.trim();
             const papers = document.querySelectorAll('.paper');
 
-            papers.forEach(paper => {
-                const title = paper.dataset.title || '';
-                const abstract = paper.dataset.abstract || '';
-
-                if (title.includes(searchTerm) || abstract.includes(searchTerm)) {
-                    paper.style.display = 'block';
-                } else {
-                    paper.style.display = 'none';
-                }
-            });
+            if (!query || !indexReady) {
+                papers.forEach(paper => { paper.style.display = 'block'; });
+            } else {
+                const hits = new Set(mini.search(query, {prefix: true}).map(r => String(r.id)));
+                papers.forEach(paper => {
+                    paper.style.display = hits.has(paper.dataset.pmid) ? 'block' : 'none';
+                });
+            }
 
             // Hide empty date sections
             document.querySelectorAll('.date-section').forEach(section => {
-                const visiblePapers = section.querySelectorAll('.paper[style="display: block"], .paper:not([style*="display: none"])');
-                section.style.display = visiblePapers.length > 0 ? 'block' : 'none';
+                const anyVisible = Array.from(section.querySelectorAll('.paper'))
+                    .some(paper => paper.style.display !== 'none');
+                section.style.display = anyVisible ? 'block' : 'none';
             });
         });
     </script>
@@ -474,7 +647,136 @@ def generate_main_html(papers):
 </html>
 """
 
-    return html
+
+def write_stylesheet():
+    """Write the static stylesheet index.html links to"""
+    os.makedirs('docs', exist_ok=True)
+    Path('docs/style.css').write_text(SITE_CSS, encoding='utf-8')
+
+
+def papers_state_digest(papers):
+    """Hash the store content the generated pages depend on"""
+    digest = hashlib.blake2b(digest_size=16)
+    for pmid, score in sorted((p.get('pmid') or '', p.get('relevance_score') or 0)
+                              for p in papers):
+        digest.update(f"{pmid}:{score};".encode())
+    return digest.hexdigest()
+
+
+def write_output(path, text):
+    """Write a published file plus a precompressed .gz sibling.
+
+    Compressing once at build time spares the edge from gzipping the
+    same bytes on every request as the outputs grow.
+    """
+    data = text.encode('utf-8')
+    Path(path).write_bytes(data)
+    with gzip.open(f"{path}.gz", 'wb', compresslevel=6) as gz:
+        gz.write(data)
+
+
+def write_search_index(papers):
+    """Write the index the page's client-side search loads once"""
+    os.makedirs('docs', exist_ok=True)
+    docs = [{'id': p['pmid'], 'title': p['title'], 'abstract': p['abstract']}
+            for p in papers if p.get('pmid')]
+    write_output('docs/search_index.json', json.dumps(docs, separators=(',', ':')))
+
+
+def generate_main_html(papers):
+    """Generate main HTML page"""
+
+    # One compound sort (newest date first, most relevant first within a
+    # date) lets groupby below walk the day sections directly, instead
+    # of bucketing into a dict and re-sorting every bucket
+    papers.sort(key=lambda p: (p['pub_date'], p.get('relevance_score', 0)),
+                reverse=True)
+    days_tracked = len({p['pub_date'] for p in papers})
+
+    repo_name = os.getenv('REPO_NAME', 'your-repo').split('/')[-1]
+
+    # Accumulate fragments and join once at the end; repeated string
+    # concatenation would copy the whole document for every paper
+    out = [PAGE_HEAD_TEMPLATE.format(
+        repo_name=repo_name,
+        total_papers=len(papers),
+        days_tracked=days_tracked,
+        high_count=len([p for p in papers if p.get('relevance_score', 0) >= 5]),
+        updated=datetime.now().strftime('%Y-%m-%d %H:%M UTC'),
+    )]
+
+    # Add papers grouped by date; show the last 30 days
+    for date, group in islice(groupby(papers, key=itemgetter('pub_date')), 30):
+        papers_on_date = list(group)
+
+        out.append(f"""
+        <div class="date-section">
+            <div class="date-header">
+                📅 {date} ({len(papers_on_date)} papers)
+            </div>
+        """)
+
+        for paper in papers_on_date:
+            relevance = paper.get('relevance_score', 0)
+
+            if relevance >= 5:
+                relevance_class = "high-relevance"
+                badge_class = "high-score"
+                badge_text = "🔥 HIGH"
+            elif relevance >= 2:
+                relevance_class = "medium-relevance"
+                badge_class = "medium-score"
+                badge_text = "⚡ MED"
+            else:
+                relevance_class = "low-relevance"
+                badge_class = "low-score"
+                badge_text = "✓ LOW"
+
+            # Escape once per field; PubMed titles do contain < and "
+            # and would otherwise break the attributes they land in
+            title = escape(paper['title'])
+            abstract = escape(paper['abstract'])
+
+            # Truncate abstract for display
+            abstract_display = abstract[:300] + "..." if len(abstract) > 300 else abstract
+
+            if paper.get('url'):
+                title_html = f'<a href="{escape(paper["url"], quote=True)}" target="_blank">{title}</a>'
+            else:
+                title_html = title
+
+            out.append(PAPER_CARD_TEMPLATE.format(
+                relevance_class=relevance_class,
+                badge_class=badge_class,
+                badge_text=badge_text,
+                title_html=title_html,
+                authors=escape(paper['authors']),
+                journal=escape(paper['journal']),
+                abstract_display=abstract_display,
+                relevance=relevance,
+                matched_terms=escape(', '.join(paper.get('matched_terms', []))),
+                pmid=paper.get('pmid', 'N/A'),
+            ))
+
+        out.append("</div>")
+
+    out.append(PAGE_FOOT)
+
+    return ''.join(out)
+
+@lru_cache(maxsize=512)
+def rfc822_date(pub_date):
+    """Format a YYYY-MM-DD date as RFC 822, or None if malformed.
+
+    Slicing the fixed-width fields skips strptime's locale and regex
+    machinery, and the cache collapses the many papers sharing a date.
+    """
+    try:
+        return datetime(int(pub_date[:4]), int(pub_date[5:7]),
+                        int(pub_date[8:10])).strftime('%a, %d %b %Y 00:00:00 +0000')
+    except (TypeError, ValueError):
+        return None
+
 
 def generate_rss_feed(papers):
     """Generate RSS feed XML"""
@@ -482,9 +784,12 @@ def generate_rss_feed(papers):
     base_url = f"https://{os.getenv('REPO_NAME', 'user/repo').replace('/', '.github.io/')}"
 
     # Sort papers by date (newest first)
-    papers_sorted = sorted(papers, key=lambda x: x['pub_date'], reverse=True)[:50]  # Last 50 papers
+    papers_sorted = sorted(papers, key=itemgetter('pub_date'), reverse=True)[:50]  # Last 50 papers
+
+    # Fallback date for malformed entries, computed once per feed
+    now_rfc = datetime.now().strftime('%a, %d %b %Y %H:%M:%S +0000')
 
-    rss = f"""<?xml version="1.0" encoding="UTF-8"?>
+    out = [f"""<?xml version="1.0" encoding="UTF-8"?>
 <rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
 <channel>
     <title>Literature Review - {repo_name}</title>
@@ -494,44 +799,46 @@ def generate_rss_feed(papers):
     <lastBuildDate>{datetime.now().strftime('%a, %d %b %Y %H:%M:%S %z')}</lastBuildDate>
     <language>en-us</language>
     <generator>GitHub Actions Literature Review System</generator>
-"""
+"""]
 
     for paper in papers_sorted:
+        # Clean the scraped fields for XML; titles routinely contain &
+        clean_title = escape(paper['title'], quote=False)
+        clean_authors = escape(paper['authors'], quote=False)
+        clean_journal = escape(paper['journal'], quote=False)
+        clean_abstract = escape(paper['abstract'], quote=False)
+
         # Create item description
         description = f"""
         <![CDATA[
-        <p><strong>Authors:</strong> {paper['authors']}</p>
-        <p><strong>Journal:</strong> {paper['journal']}</p>
+        <p><strong>Authors:</strong> {clean_authors}</p>
+        <p><strong>Journal:</strong> {clean_journal}</p>
         <p><strong>Relevance Score:</strong> {paper.get('relevance_score', 0)}</p>
         <p><strong>Matched Terms:</strong> {', '.join(paper.get('matched_terms', []))}</p>
         <br>
-        <p>{paper['abstract']}</p>
+        <p>{clean_abstract}</p>
         ]]>
         """
 
         # Convert date to RFC 2822 format
-        try:
-            pub_date = datetime.strptime(paper['pub_date'], '%Y-%m-%d')
-            pub_date_rfc = pub_date.strftime('%a, %d %b %Y 00:00:00 +0000')
-        except:
-            pub_date_rfc = datetime.now().strftime('%a, %d %b %Y %H:%M:%S +0000')
+        pub_date_rfc = rfc822_date(paper['pub_date']) or now_rfc
 
-        rss += f"""
+        out.append(f"""
     <item>
-        <title>{paper['title']}</title>
+        <title>{clean_title}</title>
         <link>{paper.get('url', base_url)}</link>
         <description>{description}</description>
         <pubDate>{pub_date_rfc}</pubDate>
         <guid>{paper.get('url', f"{base_url}#{paper.get('pmid', 'unknown')}")}</guid>
     </item>
-"""
+""")
 
-    rss += """
+    out.append("""
 </channel>
 </rss>
-"""
+""")
 
-    return rss
+    return ''.join(out)
 
 def main():
     """Main function"""
@@ -549,60 +856,69 @@ def main():
     historical_papers = load_historical_data()
     print(f"Loaded {len(historical_papers)} historical papers")
 
-    # Search for new papers
-    new_papers = search_pubmed(keywords, days_back)
+    # Search for new papers, skipping PMIDs already in the store
+    known_pmids = {p['pmid'] for p in historical_papers if p.get('pmid')}
+    new_papers = search_pubmed(keywords, days_back, known_pmids)
 
     if new_papers:
-        # Calculate relevance scores for new papers
-        new_papers_with_scores = [calculate_relevance_score(paper, keywords) for paper in new_papers]
-
-        # Combine with historical data, removing duplicates
-        all_papers = {}
-
-        # Add historical papers
-        for paper in historical_papers:
-            pmid = paper.get('pmid')
-            if pmid:
-                all_papers[pmid] = paper
-
-        # Add new papers (will override if duplicate)
-        for paper in new_papers_with_scores:
-            pmid = paper.get('pmid')
-            if pmid:
-                all_papers[pmid] = paper
+        # Calculate relevance scores for new papers; the keyword sets
+        # are flattened to terms once, not per paper
+        terms = keyword_terms(keywords)
+        automaton = build_keyword_automaton(terms)
+        new_papers_with_scores = score_papers(new_papers, terms, automaton)
+
+        # Combine with historical data, removing duplicates; new papers
+        # come last in the chain so they override historical entries
+        all_papers = {p['pmid']: p
+                      for p in chain(historical_papers, new_papers_with_scores)
+                      if p.get('pmid')}
 
         final_papers = list(all_papers.values())
 
         print(f"Found {len(new_papers_with_scores)} new papers")
         print(f"Total papers in database: {len(final_papers)}")
 
-        # Save updated papers data
-        save_papers_data(final_papers)
+        # Upsert only the new rows; the history is already on disk
+        save_papers_data(new_papers_with_scores)
 
         # Generate HTML page
-        html_content = generate_main_html(final_papers)
-        with open('docs/index.html', 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        write_stylesheet()
+        write_search_index(final_papers)
+        write_output('docs/index.html', generate_main_html(final_papers))
 
         # Generate RSS feed
-        rss_content = generate_rss_feed(final_papers)
-        with open('docs/feed.xml', 'w', encoding='utf-8') as f:
-            f.write(rss_content)
+        write_output('docs/feed.xml', generate_rss_feed(final_papers))
+
+        Path('docs/.state.sha').write_text(papers_state_digest(final_papers))
 
         print("Generated HTML page and RSS feed in docs/ directory")
 
-    else:
+    elif historical_papers:
+        # Nothing new: regenerate only if the store changed since the
+        # outputs were last written, so no-op runs stay no-op deploys
+        state = papers_state_digest(historical_papers)
+        state_path = Path('docs/.state.sha')
+        try:
+            previous_state = state_path.read_text()
+        except FileNotFoundError:
+            previous_state = None
+        if (previous_state == state
+                and os.path.exists('docs/index.html')
+                and os.path.exists('docs/feed.xml')):
+            print("No new papers and site is up to date; skipping regeneration")
+            return
+
         print("No new papers found, but updating website with existing data")
 
-        # Still generate pages with historical data
-        if historical_papers:
-            html_content = generate_main_html(historical_papers)
-            with open('docs/index.html', 'w', encoding='utf-8') as f:
-                f.write(html_content)
+        write_stylesheet()
+        write_search_index(historical_papers)
+        write_output('docs/index.html', generate_main_html(historical_papers))
+        write_output('docs/feed.xml', generate_rss_feed(historical_papers))
 
-            rss_content = generate_rss_feed(historical_papers)
-            with open('docs/feed.xml', 'w', encoding='utf-8') as f:
-                f.write(rss_content)
+        state_path.write_text(state)
+
+    else:
+        print("No papers found and no history to publish")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file